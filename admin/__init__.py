@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import hmac
 import importlib
 from flask import Blueprint, session, current_app, redirect, url_for
 
@@ -11,9 +12,21 @@ bp = Blueprint("admin", __name__, url_prefix="/admin")
 def _is_admin() -> bool:
     return bool(session.get("is_admin"))
 
+@bp.record
+def _resolve_admin_token(state) -> None:
+    # The token doesn't change after boot: resolve config/env once per app
+    state.app.extensions["admin_token"] = (state.app.config.get("ADMIN_TOKEN")
+                                           or os.environ.get("ADMIN_TOKEN", ""))
+
 def _admin_token() -> str:
-    return (current_app.config.get("ADMIN_TOKEN")
-            or os.environ.get("ADMIN_TOKEN", ""))
+    return current_app.extensions.get("admin_token", "")
+
+def _token_matches(token: str) -> bool:
+    """Constant-time check of a submitted token against the admin token."""
+    expected = _admin_token()
+    if not token or not expected:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
 
 def require_admin():
     """Redirect to admin login if not authenticated."""
@@ -1,6 +1,7 @@
 # admin/accreditations.py
 from __future__ import annotations
 
+import re
 import sqlite3
 from flask import render_template, request, redirect, url_for, flash
 from models import get_active_cities_safe  # not used here but keeps import parity style
@@ -10,7 +11,14 @@ from . import bp, _is_admin
 # ------------------------------------
 # Schema safety (idempotent, add-only)
 # ------------------------------------
+# Tables are never dropped at runtime, so once this has run in a process
+# the DDL probes (and their commit) can be skipped.
+_ACCREDITATION_SCHEMA_OK = False
+
 def _ensure_accreditation_schema(conn: sqlite3.Connection) -> None:
+    global _ACCREDITATION_SCHEMA_OK
+    if _ACCREDITATION_SCHEMA_OK:
+        return
     conn.execute("""
         CREATE TABLE IF NOT EXISTS accreditation_types(
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,21 +40,32 @@ def _ensure_accreditation_schema(conn: sqlite3.Connection) -> None:
         )
     """)
     conn.commit()
+    _ACCREDITATION_SCHEMA_OK = True
+
 
+# Any run of non-alphanumerics (\w is alnum plus "_", so exclude "_" too)
+_SLUG_SEPARATORS = re.compile(r"[\W_]+")
 
 def _slugify(name: str) -> str:
     s = (name or "").strip().lower()
-    out = []
-    prev_dash = False
-    for ch in s:
-        if ch.isalnum():
-            out.append(ch)
-            prev_dash = False
-        else:
-            if not prev_dash:
-                out.append("-")
-                prev_dash = True
-    slug = "".join(out).strip("-") or "accreditation"
+    slug = _SLUG_SEPARATORS.sub("-", s).strip("-") or "accreditation"
+    return slug
+
+
+def _unique_slug(conn: sqlite3.Connection, base: str, exclude_id: int = 0) -> str:
+    """
+    `base` if no other accreditation uses it, else the first free `base-N`
+    (N from 2). Conflicting slugs are fetched with one query.
+    """
+    taken = {r["slug"] for r in conn.execute(
+        "SELECT slug FROM accreditation_types WHERE (slug=? OR slug LIKE ? || '-%') AND id<>?",
+        (base, base, exclude_id),
+    ).fetchall()}
+    slug = base
+    i = 2
+    while slug in taken:
+        slug = f"{base}-{i}"
+        i += 1
     return slug
 
 
@@ -72,23 +91,14 @@ def admin_accreditations():
                 if not name:
                     flash("Name is required.", "error")
                 else:
-                    base = _slugify(name)
-                    # ensure unique slug
-                    slug = base
-                    i = 2
-                    while conn.execute(
-                        "SELECT 1 FROM accreditation_types WHERE slug=?", (slug,)
-                    ).fetchone():
-                        slug = f"{base}-{i}"
-                        i += 1
+                    slug = _unique_slug(conn, _slugify(name))
                     try:
-                        # sort_order to end of list
-                        row = conn.execute("SELECT COALESCE(MAX(sort_order),0) AS m FROM accreditation_types").fetchone()
-                        next_sort = int(row["m"] if row and "m" in row.keys() else 0) + 10
+                        # sort_order to end of list (worked out inside the INSERT)
                         conn.execute("""
                             INSERT INTO accreditation_types(name, slug, is_active, sort_order, help_text)
-                            VALUES(?,?,?,?,?)
-                        """, (name, slug, active, next_sort, help_text))
+                            SELECT ?, ?, ?, COALESCE(MAX(sort_order),0) + 10, ?
+                              FROM accreditation_types
+                        """, (name, slug, active, help_text))
                         conn.commit()
                         flash(f"Added accreditation: {name}", "ok")
                     except sqlite3.IntegrityError:
@@ -130,14 +140,7 @@ def admin_accreditations():
                     slug = (row["slug"] if row and "slug" in row.keys() else "") or _slugify(name)
                     # ensure slug unique if we just generated it
                     if not row or not row["slug"]:
-                        base = slug
-                        i = 2
-                        while conn.execute(
-                            "SELECT 1 FROM accreditation_types WHERE slug=? AND id<>?",
-                            (slug, aid)
-                        ).fetchone():
-                            slug = f"{base}-{i}"
-                            i += 1
+                        slug = _unique_slug(conn, slug, aid)
                     conn.execute("""
                         UPDATE accreditation_types
                            SET name=?,
@@ -152,19 +155,27 @@ def admin_accreditations():
             elif action == "reorder":
                 # Accepts multiple sort_order[id]=value pairs
                 # Form fields will be like order_<id>
-                rows = conn.execute("SELECT id FROM accreditation_types").fetchall()
-                ids = [int(r["id"]) for r in rows] if rows else []
-                changed = 0
-                for rid in ids:
+                # Only rows whose number actually changed are written, in one
+                # executemany inside one transaction.
+                rows = conn.execute("SELECT id, sort_order FROM accreditation_types").fetchall()
+                changes = []
+                for rid, current in rows:
                     key = f"order_{rid}"
                     try:
                         val = int(request.form.get(key) or 0)
                     except Exception:
                         val = 0
-                    conn.execute("UPDATE accreditation_types SET sort_order=? WHERE id=?", (val, rid))
-                    changed += 1
-                conn.commit()
-                if changed:
+                    if val != current:
+                        changes.append((val, rid))
+                if changes:
+                    try:
+                        conn.execute("BEGIN")
+                        conn.executemany("UPDATE accreditation_types SET sort_order=? WHERE id=?", changes)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                if rows:
                     flash("Order saved.", "ok")
 
         items = conn.execute("""
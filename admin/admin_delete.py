@@ -4,7 +4,9 @@ import os
 from typing import Iterable, List
 from flask import request, render_template, redirect, url_for, flash
 from db import get_db
-from . import bp, require_admin, _admin_token
+from utils import remove_files_later
+from . import bp, require_admin, _token_matches
+from .stats import invalidate_stats_cache
 
 # Resolve absolute /static path (project-root/static)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -19,96 +21,134 @@ def _abs_static_path(rel_path: str) -> str:
         return abs_path
     return ""  # refuse anything outside /static
 
-def _unlink_quiet(path: str) -> None:
-    try:
-        if path and os.path.isfile(path):
-            os.remove(path)
-    except Exception:
-        pass
+# Tables are created at boot and never dropped at runtime, so a table seen
+# once is remembered for the process; missing ones are re-checked (they may
+# be created later by ensure_db or a migration).
+_EXISTING_TABLES: set[str] = set()
 
 def _table_exists(conn, name: str) -> bool:
-    return bool(conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (name,)
-    ).fetchone())
-
-def _gather_house_file_paths(conn, house_id: int) -> List[str]:
-    """All files tied to one house (house images, room images, floorplans, docs)."""
-    paths: List[str] = []
-
-    # House images
-    for r in conn.execute("SELECT file_path FROM house_images WHERE house_id=?", (house_id,)).fetchall():
-        p = _abs_static_path(r["file_path"]); p and paths.append(p)
-
-    # Room images via rooms
-    if _table_exists(conn, "room_images"):
-        for r in conn.execute("""
-            SELECT ri.file_path
-              FROM room_images ri
-              JOIN rooms r ON r.id = ri.room_id
-             WHERE r.house_id = ?
-        """, (house_id,)).fetchall():
-            p = _abs_static_path(r["file_path"]); p and paths.append(p)
-
-    # Floorplans (optional)
-    if _table_exists(conn, "house_floorplans"):
-        for r in conn.execute("SELECT file_path FROM house_floorplans WHERE house_id=?", (house_id,)).fetchall():
-            p = _abs_static_path(r["file_path"]); p and paths.append(p)
-
-    # Documents (optional)
-    if _table_exists(conn, "house_documents"):
-        for r in conn.execute("SELECT file_path FROM house_documents WHERE house_id=?", (house_id,)).fetchall():
-            p = _abs_static_path(r["file_path"]); p and paths.append(p)
-
-    # de-dup
-    return list(dict.fromkeys(paths))
+    if name in _EXISTING_TABLES:
+        return True
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone():
+        _EXISTING_TABLES.add(name)
+        return True
+    return False
+
+# (child, fk column, parent) links a landlord delete has to reach
+_CASCADE_LINKS = (
+    ("landlord_profiles", "landlord_id", "landlords"),
+    ("houses",            "landlord_id", "landlords"),
+    ("rooms",             "house_id",    "houses"),
+    ("house_images",      "house_id",    "houses"),
+    ("room_images",       "room_id",     "rooms"),
+    ("house_floorplans",  "house_id",    "houses"),
+    ("house_documents",   "house_id",    "houses"),
+)
+# Cascades are only ever added (see migrate_add_cascades), so a positive
+# answer is kept for the life of the process.
+_CASCADES_OK = False
+
+def _cascades_in_place(conn) -> bool:
+    """
+    True when foreign keys are enforced on this connection and every existing
+    child table ON DELETE CASCADEs to its parent, so deleting the landlord row
+    removes everything beneath it.
+    """
+    global _CASCADES_OK
+    if not conn.execute("PRAGMA foreign_keys").fetchone()[0]:
+        return False
+    if _CASCADES_OK:
+        return True
+    for child, col, parent in _CASCADE_LINKS:
+        if not _table_exists(conn, child):
+            continue
+        if not conn.execute("""
+            SELECT 1 FROM pragma_foreign_key_list(?)
+             WHERE "table"=? AND "from"=? AND upper(on_delete)='CASCADE'
+        """, (child, parent, col)).fetchone():
+            return False
+    _CASCADES_OK = True
+    return True
 
 def _gather_landlord_file_paths(conn, landlord_id: int) -> List[str]:
-    paths: List[str] = []
-    house_ids = [r["id"] for r in conn.execute("SELECT id FROM houses WHERE landlord_id=?", (landlord_id,)).fetchall()]
-    for hid in house_ids:
-        paths.extend(_gather_house_file_paths(conn, hid))
-    return list(dict.fromkeys(paths))
+    """
+    All files tied to a landlord (house images, room images, floorplans, docs,
+    profile logo/photo), collected with one UNION ALL query.
+    """
+    parts = ["""
+        SELECT hi.file_path FROM house_images hi
+          JOIN houses h ON h.id = hi.house_id WHERE h.landlord_id = :lid
+    """]
+    if _table_exists(conn, "room_images"):
+        parts.append("""
+        SELECT ri.file_path FROM room_images ri
+          JOIN rooms r ON r.id = ri.room_id
+          JOIN houses h ON h.id = r.house_id WHERE h.landlord_id = :lid
+        """)
+    # Optional tables
+    for table in ("house_floorplans", "house_documents"):
+        if _table_exists(conn, table):
+            parts.append(f"""
+        SELECT t.file_path FROM {table} t
+          JOIN houses h ON h.id = t.house_id WHERE h.landlord_id = :lid
+            """)
+    parts.append("""
+        SELECT logo_path FROM landlord_profiles WHERE landlord_id = :lid AND logo_path IS NOT NULL
+        UNION ALL
+        SELECT photo_path FROM landlord_profiles WHERE landlord_id = :lid AND photo_path IS NOT NULL
+    """)
+
+    paths = (_abs_static_path(fp) for (fp,) in conn.execute(
+        " UNION ALL ".join(parts), {"lid": landlord_id}
+    ))
+    # de-dup, drop refused paths
+    return [p for p in dict.fromkeys(paths) if p]
 
 def _counts_for_landlord(conn, landlord_id: int) -> dict:
-    """Return counts for a pre-delete summary screen."""
-    counts = {
-        "houses": 0, "rooms": 0,
-        "house_images": 0, "room_images": 0,
-        "documents": 0, "floorplans": 0,
-    }
-    counts["houses"] = conn.execute("SELECT COUNT(*) c FROM houses WHERE landlord_id=?", (landlord_id,)).fetchone()["c"]
-    counts["rooms"] = conn.execute("""
-        SELECT COUNT(*) c FROM rooms WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-    """, (landlord_id,)).fetchone()["c"]
-
-    counts["house_images"] = conn.execute("""
-        SELECT COUNT(*) c FROM house_images WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-    """, (landlord_id,)).fetchone()["c"]
-
-    if _table_exists(conn, "room_images"):
-        counts["room_images"] = conn.execute("""
-            SELECT COUNT(*) c
-              FROM room_images
-             WHERE room_id IN (
-                SELECT id FROM rooms WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-             )
-        """, (landlord_id,)).fetchone()["c"]
-
-    if _table_exists(conn, "house_documents"):
-        counts["documents"] = conn.execute("""
-            SELECT COUNT(*) c
-              FROM house_documents
-             WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-        """, (landlord_id,)).fetchone()["c"]
-
-    if _table_exists(conn, "house_floorplans"):
-        counts["floorplans"] = conn.execute("""
-            SELECT COUNT(*) c
-              FROM house_floorplans
-             WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-        """, (landlord_id,)).fetchone()["c"]
-
-    return counts
+    """Return counts for a pre-delete summary screen (one statement)."""
+    # Optional tables count as 0 when absent
+    def _count(table: str, where: str) -> str:
+        return f"(SELECT COUNT(*) FROM {table} WHERE {where})" if _table_exists(conn, table) else "0"
+
+    row = conn.execute(f"""
+        WITH hs(id) AS (SELECT id FROM houses WHERE landlord_id=?),
+             rs(id) AS (SELECT id FROM rooms WHERE house_id IN hs)
+        SELECT (SELECT COUNT(*) FROM hs) AS houses,
+               (SELECT COUNT(*) FROM rs) AS rooms,
+               (SELECT COUNT(*) FROM house_images WHERE house_id IN hs) AS house_images,
+               {_count("room_images", "room_id IN rs")} AS room_images,
+               {_count("house_documents", "house_id IN hs")} AS documents,
+               {_count("house_floorplans", "house_id IN hs")} AS floorplans
+    """, (landlord_id,)).fetchone()
+    return dict(row)
+
+def _delete_landlord_rows(conn, lid: int) -> None:
+    """Explicit child-first delete, for databases still missing a cascade."""
+    # House and room ids are read once and bound as IN lists, rather than
+    # re-running the houses subquery for every child table.
+    house_ids = [hid for (hid,) in conn.execute("SELECT id FROM houses WHERE landlord_id=?", (lid,))]
+    if house_ids:
+        hs = ",".join("?" * len(house_ids))
+        room_ids = [rid for (rid,) in conn.execute(f"SELECT id FROM rooms WHERE house_id IN ({hs})", house_ids)]
+
+        # child assets
+        if room_ids and _table_exists(conn, "room_images"):
+            rs = ",".join("?" * len(room_ids))
+            conn.execute(f"DELETE FROM room_images WHERE room_id IN ({rs})", room_ids)
+        conn.execute(f"DELETE FROM house_images WHERE house_id IN ({hs})", house_ids)
+        for table in ("house_documents", "house_floorplans"):
+            if _table_exists(conn, table):
+                conn.execute(f"DELETE FROM {table} WHERE house_id IN ({hs})", house_ids)
+
+        # rooms and houses
+        conn.execute(f"DELETE FROM rooms WHERE house_id IN ({hs})", house_ids)
+        conn.execute("DELETE FROM houses WHERE landlord_id=?", (lid,))
+
+    # profile then landlord
+    conn.execute("DELETE FROM landlord_profiles WHERE landlord_id=?", (lid,))
+    conn.execute("DELETE FROM landlords WHERE id=?", (lid,))
 
 # -------------------------------------------------------------------
 # STEP 1 — Confirm target (type landlord email or display name)
@@ -120,8 +160,8 @@ def delete_landlord_start(lid: int):
 
     conn = get_db()
     try:
-        landlord = conn.execute("SELECT * FROM landlords WHERE id=?", (lid,)).fetchone()
-        profile  = conn.execute("SELECT * FROM landlord_profiles WHERE landlord_id=?", (lid,)).fetchone()
+        landlord = conn.execute("SELECT id, email FROM landlords WHERE id=?", (lid,)).fetchone()
+        profile  = conn.execute("SELECT display_name FROM landlord_profiles WHERE landlord_id=?", (lid,)).fetchone()
         if not landlord:
             flash("Landlord not found.", "error")
             return redirect(url_for("admin.admin_landlords"))
@@ -152,14 +192,14 @@ def delete_landlord_password(lid: int):
 
     conn = get_db()
     try:
-        landlord = conn.execute("SELECT * FROM landlords WHERE id=?", (lid,)).fetchone()
+        landlord = conn.execute("SELECT id, email FROM landlords WHERE id=?", (lid,)).fetchone()
         if not landlord:
             flash("Landlord not found.", "error")
             return redirect(url_for("admin.admin_landlords"))
 
         if request.method == "POST":
             token = (request.form.get("admin_token") or "").strip()
-            if token and _admin_token() and token == _admin_token():
+            if _token_matches(token):
                 # move to final step
                 return redirect(url_for("admin.delete_landlord_final", lid=lid))
             flash("Invalid admin token.", "error")
@@ -178,8 +218,8 @@ def delete_landlord_final(lid: int):
 
     conn = get_db()
     try:
-        landlord = conn.execute("SELECT * FROM landlords WHERE id=?", (lid,)).fetchone()
-        profile  = conn.execute("SELECT * FROM landlord_profiles WHERE landlord_id=?", (lid,)).fetchone()
+        landlord = conn.execute("SELECT id, email FROM landlords WHERE id=?", (lid,)).fetchone()
+        profile  = conn.execute("SELECT display_name FROM landlord_profiles WHERE landlord_id=?", (lid,)).fetchone()
         if not landlord:
             flash("Landlord not found.", "error")
             return redirect(url_for("admin.admin_landlords"))
@@ -197,42 +237,14 @@ def delete_landlord_final(lid: int):
             file_paths = _gather_landlord_file_paths(conn, lid)
 
             try:
-                conn.execute("BEGIN")
-                # child assets
-                if _table_exists(conn, "room_images"):
-                    conn.execute("""
-                        DELETE FROM room_images
-                         WHERE room_id IN (
-                             SELECT id FROM rooms
-                              WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-                         )
-                    """, (lid,))
-                conn.execute("""
-                    DELETE FROM house_images
-                     WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-                """, (lid,))
-                if _table_exists(conn, "house_documents"):
-                    conn.execute("""
-                        DELETE FROM house_documents
-                         WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-                    """, (lid,))
-                if _table_exists(conn, "house_floorplans"):
-                    conn.execute("""
-                        DELETE FROM house_floorplans
-                         WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-                    """, (lid,))
-
-                # rooms and houses
-                conn.execute("""
-                    DELETE FROM rooms
-                     WHERE house_id IN (SELECT id FROM houses WHERE landlord_id=?)
-                """, (lid,))
-                conn.execute("DELETE FROM houses WHERE landlord_id=?", (lid,))
-
-                # profile then landlord
-                conn.execute("DELETE FROM landlord_profiles WHERE landlord_id=?", (lid,))
-                conn.execute("DELETE FROM landlords WHERE id=?", (lid,))
-
+                # IMMEDIATE takes the write lock up front, so the delete can't
+                # fail with SQLITE_BUSY halfway through upgrading from a read
+                conn.execute("BEGIN IMMEDIATE")
+                if _cascades_in_place(conn):
+                    # The engine removes profile, houses, rooms, images and docs
+                    conn.execute("DELETE FROM landlords WHERE id=?", (lid,))
+                else:
+                    _delete_landlord_rows(conn, lid)
                 conn.commit()
             except Exception as e:
                 try: conn.rollback()
@@ -242,9 +254,9 @@ def delete_landlord_final(lid: int):
                                        landlord=landlord, profile=profile, counts=counts)
 
             # best-effort file cleanup
-            for p in file_paths:
-                _unlink_quiet(p)
+            remove_files_later(file_paths)
 
+            invalidate_stats_cache()
             flash("Landlord and all associated data were deleted.", "ok")
             return redirect(url_for("admin.admin_landlords"))
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from flask import render_template, request, redirect, url_for, session, flash, current_app
-from . import bp, _admin_token, _is_admin
+from . import bp, _token_matches, _is_admin
 
 
 @bp.route("/")
@@ -18,7 +18,7 @@ def admin_login():
     try:
         if request.method == "POST":
             token = (request.form.get("token") or "").strip()
-            if _admin_token() and token == _admin_token():
+            if _token_matches(token):
                 session["is_admin"] = True
                 flash("Admin session started.", "ok")
                 # ✅ go straight to dashboard now
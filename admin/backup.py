@@ -1,16 +1,28 @@
 # admin/backup.py
 from __future__ import annotations
 
-import io, os, time, json, zipfile, traceback
+import os, time, json, sqlite3, zipfile, tempfile, traceback
 from pathlib import Path
 from flask import request, abort, jsonify, send_file, current_app
+from db import DB_PATH
 from . import bp, require_admin
 
-# Safe import: don't explode if Dropbox isn't configured in this env
-try:
-    from backup_to_dropbox import run_backup
-except Exception:
-    run_backup = None
+# The Dropbox SDK (and its requests/urllib3 stack) is only needed by the
+# daily cron call, so it is imported on first use rather than at boot.
+def _load_run_backup():
+    """Return backup_to_dropbox.run_backup, or None if Dropbox isn't available."""
+    try:
+        from backup_to_dropbox import run_backup
+    except Exception:
+        return None
+    return run_backup
+
+
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.remove(path)
+    except Exception:
+        pass
 
 
 # ---------- 1) INSTANT DOWNLOAD ----------
@@ -24,52 +36,72 @@ def admin_backup_download():
     if maybe_redirect:
         return maybe_redirect
 
-    # Get DB path lazily
-    try:
-        from db import DB_PATH
-    except Exception:
-        abort(500, "DB not available")
-
     project_root = Path(__file__).resolve().parents[1]
     uploads_dir = project_root / "static" / "uploads"
 
+    # The live DB (and its WAL/SHM/journal) may sit under uploads; it goes in
+    # as a snapshot instead, so the raw files are skipped by the walk.
+    live_db = os.path.abspath(DB_PATH)
+    skip_files = {live_db + sfx for sfx in ("", "-wal", "-shm", "-journal")}
+
     def _add_dir_to_zip(zf: zipfile.ZipFile, base: Path, arc_prefix: str) -> dict:
-        total_files, total_bytes = 0, 0
-        if not base.exists():
-            return {"files": 0, "bytes": 0}
-        for root, dirs, files in os.walk(base):
-            dirs[:] = [d for d in dirs if d not in (".git", "__pycache__")]
-            for name in files:
-                if name.endswith((".pyc", ".pyo", ".DS_Store")):
-                    continue
-                abs_path = Path(root) / name
+        # os.scandir rather than os.walk + Path: DirEntry carries the type and
+        # a cached stat, and arcnames are built by plain string joins.
+        totals = {"files": 0, "bytes": 0}
+
+        def _walk(dir_path: str, arc_dir: str) -> None:
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                return
+            for entry in entries:
+                name = entry.name
                 try:
-                    rel = abs_path.relative_to(base)
-                except Exception:
-                    rel = Path(name)
-                arcname = str(Path(arc_prefix) / rel)
-                try:
-                    zf.write(abs_path, arcname)
-                    st = abs_path.stat()
-                    total_files += 1
-                    total_bytes += int(st.st_size)
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in (".git", "__pycache__"):
+                            _walk(entry.path, f"{arc_dir}/{name}")
+                        continue
+                    if name.endswith((".pyc", ".pyo", ".DS_Store")) or entry.path in skip_files:
+                        continue
+                    st = entry.stat()
+                    zf.write(entry.path, f"{arc_dir}/{name}")
+                    totals["files"] += 1
+                    totals["bytes"] += int(st.st_size)
                 except Exception:
                     pass
-        return {"files": total_files, "bytes": total_bytes}
 
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        if base.is_dir():
+            _walk(str(base), arc_prefix)
+        return totals
+
+    # Built in an anonymous temp file rather than in memory, so peak RAM no
+    # longer grows with the size of the uploads; the OS reclaims the file
+    # once send_file has streamed it and closed the handle.
+    buf = tempfile.TemporaryFile(suffix=".zip")
+    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
         ts = time.strftime("%Y-%m-%dT%H-%M-%SZ", time.gmtime())
 
-        # 1) Database
+        # 1) Database: a consistent snapshot via SQLite's online backup API
+        # (copying the live file could catch a half-applied write or miss
+        # commits still sitting in the WAL)
         db_info = {"exists": False, "bytes": 0, "path": DB_PATH}
-        try:
-            db_path = Path(DB_PATH)
-            if db_path.exists():
-                zf.write(db_path, arcname="database/student_palace.db")
-                db_info.update({"exists": True, "bytes": int(db_path.stat().st_size)})
-        except Exception:
-            pass
+        if Path(DB_PATH).exists():
+            fd, snap_path = tempfile.mkstemp(suffix=".db")
+            os.close(fd)
+            try:
+                src = sqlite3.connect(DB_PATH, timeout=15)
+                dst = sqlite3.connect(snap_path)
+                try:
+                    src.backup(dst, pages=1024, sleep=0)
+                finally:
+                    dst.close()
+                    src.close()
+                zf.write(snap_path, arcname="database/student_palace.db")
+                db_info.update({"exists": True, "bytes": os.path.getsize(snap_path)})
+            except Exception:
+                pass
+            finally:
+                _unlink_quiet(snap_path)
 
         # 2) Uploads
         uploads_info = _add_dir_to_zip(zf, uploads_dir, "site-files/static/uploads")
@@ -77,7 +109,7 @@ def admin_backup_download():
         # 3) Manifest
         manifest = {
             "created_at": ts,
-            "notes": "Student Palace manual backup (in-memory).",
+            "notes": "Student Palace manual backup.",
             "database": db_info,
             "uploads": uploads_info,
             "paths": {"db_path": DB_PATH, "uploads_dir": str(uploads_dir)},
@@ -111,6 +143,7 @@ def admin_backup_cron():
     if not expected or token != expected:
         return abort(403, "Forbidden: missing or invalid token")
 
+    run_backup = _load_run_backup()
     if run_backup is None:
         return abort(500, "Dropbox backup not configured")
 
@@ -9,7 +9,7 @@ from urllib.parse import urlencode
 from urllib.request import urlopen, Request
 from urllib.error import URLError
 from flask import render_template, request, redirect, url_for, flash, jsonify
-from models import get_db
+from models import get_db, invalidate_city_cache
 from . import bp, _is_admin
 
 # ---------------------------
@@ -19,11 +19,18 @@ from . import bp, _is_admin
 _PREFIX_SPLIT_RE = re.compile(r"\s*,\s*")
 _PREFIX_NORMALISE_RE = re.compile(r"[^A-Z0-9]")
 
+# Set once the schema has been verified; the columns never go away at runtime,
+# so later /admin/cities hits skip the CREATE + PRAGMA round-trips.
+_CITIES_SCHEMA_OK = False
+
 def _ensure_cities_schema(conn: sqlite3.Connection) -> None:
     """
     Ensure the cities table exists and includes postcode_prefixes TEXT.
     Non-destructive: add-only.
     """
+    global _CITIES_SCHEMA_OK
+    if _CITIES_SCHEMA_OK:
+        return
     conn.execute(
         "CREATE TABLE IF NOT EXISTS cities("
         " id INTEGER PRIMARY KEY AUTOINCREMENT,"
@@ -38,10 +45,22 @@ def _ensure_cities_schema(conn: sqlite3.Connection) -> None:
         if "postcode_prefixes" not in cols:
             conn.execute("ALTER TABLE cities ADD COLUMN postcode_prefixes TEXT NOT NULL DEFAULT ''")
             conn.commit()
+        _CITIES_SCHEMA_OK = True
     except Exception:
         # If anything odd happens, we leave it; page will still work without prefixes.
         pass
 
+def _cities_changed() -> None:
+    """Call after any committed write to cities."""
+    invalidate_city_cache()
+
+def _admin_city_rows(conn: sqlite3.Connection) -> list:
+    # A handful of rows: reading them is as cheap as any cache check would be
+    return conn.execute(
+        "SELECT id, name, is_active, COALESCE(postcode_prefixes,'') AS postcode_prefixes "
+        "FROM cities ORDER BY name ASC"
+    ).fetchall()
+
 def _normalise_prefixes_csv(raw: str) -> str:
     """
     Turn a user-entered CSV into a clean, uppercase, comma-separated string.
@@ -176,6 +195,7 @@ def admin_cities():
                             (name, 1, prefixes),
                         )
                         conn.commit()
+                        _cities_changed()
                         flash(f"Added city: {name}", "ok")
                     except sqlite3.IntegrityError:
                         flash("That city already exists.", "error")
@@ -189,6 +209,7 @@ def admin_cities():
                     if action == "delete":
                         conn.execute("DELETE FROM cities WHERE id=?", (cid,))
                         conn.commit()
+                        _cities_changed()
                         flash("City deleted.", "ok")
                     else:
                         new_val = 1 if action == "activate" else 0
@@ -196,12 +217,10 @@ def admin_cities():
                             "UPDATE cities SET is_active=? WHERE id=?", (new_val, cid)
                         )
                         conn.commit()
+                        _cities_changed()
                         flash("City updated.", "ok")
 
-        rows = conn.execute(
-            "SELECT id, name, is_active, COALESCE(postcode_prefixes,'') AS postcode_prefixes "
-            "FROM cities ORDER BY name ASC"
-        ).fetchall()
+        rows = _admin_city_rows(conn)
         return render_template("admin_cities.html", cities=rows)
     finally:
         conn.close()
@@ -258,6 +277,7 @@ def admin_city_edit(cid: int):
                     (name, prefixes, cid)
                 )
                 conn.commit()
+                _cities_changed()
                 flash("City updated.", "ok")
                 return redirect(url_for("admin.admin_cities"))
 
@@ -1,17 +1,28 @@
 # admin/landlords.py
 from __future__ import annotations
 
+import secrets
+from urllib.parse import urlencode
 from flask import render_template, request, redirect, url_for, flash
 from werkzeug.security import generate_password_hash
 from models import get_db
+from utils import slugify, unique_public_slug
 from . import bp, _is_admin
+from .stats import invalidate_stats_cache
 
 
+# ensure_db() already creates the table at boot, so this fallback only needs
+# to run once per process rather than on every admin hit.
+_PROFILES_TABLE_OK = False
+
 def _ensure_landlord_profiles_table(conn) -> None:
     """
     Create landlord_profiles if it doesn't exist.
-    Safe to call on every request.
+    Safe to call on every request (no-op after the first success).
     """
+    global _PROFILES_TABLE_OK
+    if _PROFILES_TABLE_OK:
+        return
     conn.execute("""
         CREATE TABLE IF NOT EXISTS landlord_profiles (
             landlord_id   INTEGER PRIMARY KEY,
@@ -25,6 +36,20 @@ def _ensure_landlord_profiles_table(conn) -> None:
             FOREIGN KEY (landlord_id) REFERENCES landlords(id) ON DELETE CASCADE
         );
     """)
+    _PROFILES_TABLE_OK = True
+
+
+# landlords_fts is built by ensure_db() when SQLite has FTS5 + trigram;
+# looked up once per process.
+_SEARCH_INDEX = None
+
+def _has_search_index(conn) -> bool:
+    global _SEARCH_INDEX
+    if _SEARCH_INDEX is None:
+        _SEARCH_INDEX = bool(conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='landlords_fts'"
+        ).fetchone())
+    return _SEARCH_INDEX
 
 
 # -------------------------
@@ -36,39 +61,84 @@ def admin_landlords():
         return redirect(url_for("admin.admin_login"))
 
     q = (request.args.get("q") or "").strip().lower()
+
+    # Keyset pagination: a page is "the next `limit` rows older than
+    # (before_ts, before_id)", so deep pages cost the same as the first.
+    try:
+        limit = int(request.args.get("limit", 50))
+    except Exception:
+        limit = 50
+    if limit < 1:
+        limit = 1
+    if limit > 200:
+        limit = 200
+    before_ts = request.args.get("before_ts") or None
+    try:
+        before_id = int(request.args.get("before_id") or 0)
+    except Exception:
+        before_id = 0
+    if not before_id:
+        before_ts = None
+
     conn = get_db()
     try:
         _ensure_landlord_profiles_table(conn)
 
-        if q:
-            rows = conn.execute("""
-                SELECT l.id,
-                       l.email,
-                       l.created_at,
-                       COALESCE(p.display_name,'') AS display_name,
-                       COALESCE(p.public_slug,'')  AS public_slug,
-                       COALESCE(p.profile_views,0) AS profile_views,
-                       COALESCE(p.is_verified,0)   AS is_verified
-                  FROM landlords l
-             LEFT JOIN landlord_profiles p ON p.landlord_id = l.id
-                 WHERE LOWER(l.email) LIKE ? OR LOWER(COALESCE(p.display_name,'')) LIKE ?
-              ORDER BY l.created_at DESC
-            """, (f"%{q}%", f"%{q}%")).fetchall()
+        if len(q) >= 3 and _has_search_index(conn):
+            # Trigram FTS: substring match on email/display_name via the index.
+            # q is quoted as one phrase so its punctuation is not FTS syntax.
+            phrase = '"' + q.replace('"', '""') + '"'
+            where, params = "l.id IN (SELECT rowid FROM landlords_fts WHERE landlords_fts MATCH ?)", (phrase,)
         else:
-            rows = conn.execute("""
-                SELECT l.id,
-                       l.email,
-                       l.created_at,
-                       COALESCE(p.display_name,'') AS display_name,
-                       COALESCE(p.public_slug,'')  AS public_slug,
-                       COALESCE(p.profile_views,0) AS profile_views,
-                       COALESCE(p.is_verified,0)   AS is_verified
-                  FROM landlords l
-             LEFT JOIN landlord_profiles p ON p.landlord_id = l.id
-              ORDER BY l.created_at DESC
-            """).fetchall()
-
-        return render_template("admin_landlords.html", landlords=rows, q=q)
+            # Short queries (trigrams need 3+ chars), the plain list, and DBs
+            # without FTS5 share one LIKE statement: an empty q gives '%%',
+            # which matches every row. LIKE is already case-insensitive for
+            # ASCII, and q's own % and _ are escaped so they match literally.
+            like = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where = "(l.email LIKE ? ESCAPE '\\' OR COALESCE(p.display_name,'') LIKE ? ESCAPE '\\')"
+            params = (like, like)
+        # One extra row tells us whether there is a next page
+        rows = conn.execute(f"""
+            SELECT l.id,
+                   l.email,
+                   l.created_at,
+                   COALESCE(p.display_name,'') AS display_name,
+                   COALESCE(p.public_slug,'')  AS public_slug,
+                   COALESCE(p.profile_views,0) AS profile_views,
+                   COALESCE(p.is_verified,0)   AS is_verified
+              FROM landlords l
+         LEFT JOIN landlord_profiles p ON p.landlord_id = l.id
+             WHERE {where}
+               AND (? IS NULL OR (l.created_at, l.id) < (?, ?))
+          ORDER BY l.created_at DESC, l.id DESC
+             LIMIT ?
+        """, (*params, before_ts, before_ts, before_id, limit + 1)).fetchall()
+
+        # Build pagination URLs in Python (same approach as admin_images)
+        base_params = {}
+        if q:
+            base_params["q"] = q
+        if limit != 50:
+            base_params["limit"] = limit
+        base_url = url_for("admin.admin_landlords")
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_params = dict(base_params, before_ts=rows[-1]["created_at"], before_id=rows[-1]["id"])
+            next_url = base_url + "?" + urlencode(next_params)
+
+        first_url = None
+        if before_ts is not None:
+            first_url = base_url + ("?" + urlencode(base_params) if base_params else "")
+
+        return render_template(
+            "admin_landlords.html",
+            landlords=rows,
+            q=q,
+            next_url=next_url,
+            first_url=first_url,
+        )
     finally:
         conn.close()
 
@@ -76,6 +146,8 @@ def admin_landlords():
 # -----------------------------------------
 # Landlord detail / edit / actions / delete
 # -----------------------------------------
+_HOUSES_PER_PAGE = 50
+
 @bp.route("/landlords/<int:lid>", methods=["GET", "POST"])  # NEW plural path
 @bp.route("/landlord/<int:lid>",  methods=["GET", "POST"])  # existing singular
 def admin_landlord_detail(lid: int):
@@ -104,30 +176,35 @@ def admin_landlord_detail(lid: int):
 
             elif action == "reset_password":
                 new_pw = (request.form.get("new_password") or "").strip()
+                msg = "Password reset."
                 if not new_pw:
-                    import secrets
                     new_pw = secrets.token_urlsafe(8)
-                    flash(f"Generated temporary password: {new_pw}", "ok")
+                    msg += f" Generated temporary password: {new_pw}"
                 ph = generate_password_hash(new_pw)
                 conn.execute(
                     "UPDATE landlords SET password_hash=? WHERE id=?",
                     (ph, lid)
                 )
                 conn.commit()
-                flash("Password reset.", "ok")
+                flash(msg, "ok")
 
             elif action == "set_verified":
-                # Ensure profile row exists, then set flag from checkbox
-                conn.execute(
-                    "INSERT OR IGNORE INTO landlord_profiles(landlord_id) VALUES(?)",
-                    (lid,)
-                )
+                # Ensure profile row exists, then set flag from checkbox (one transaction)
                 is_verified = 1 if request.form.get("is_verified") == "on" else 0
-                conn.execute(
-                    "UPDATE landlord_profiles SET is_verified=? WHERE landlord_id=?",
-                    (is_verified, lid)
-                )
-                conn.commit()
+                try:
+                    conn.execute("BEGIN")
+                    conn.execute(
+                        "INSERT OR IGNORE INTO landlord_profiles(landlord_id) VALUES(?)",
+                        (lid,)
+                    )
+                    conn.execute(
+                        "UPDATE landlord_profiles SET is_verified=? WHERE landlord_id=?",
+                        (is_verified, lid)
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
                 flash("Verification status updated.", "ok")
 
             elif action == "update_profile":
@@ -136,76 +213,102 @@ def admin_landlord_detail(lid: int):
                 website      = (request.form.get("website") or "").strip()
                 bio          = (request.form.get("bio") or "").strip()
 
-                # Ensure profile row exists
-                conn.execute(
-                    "INSERT OR IGNORE INTO landlord_profiles(landlord_id) VALUES(?)",
-                    (lid,)
-                )
-                prof = conn.execute(
-                    "SELECT * FROM landlord_profiles WHERE landlord_id=?",
-                    (lid,)
-                ).fetchone()
-
-                # Auto-generate slug if missing and we have a display name
-                slug = prof["public_slug"] if prof else None
-                if not slug and display_name:
-                    s = display_name.lower()
-                    out = []
-                    for ch in s:
-                        if ch.isalnum():
-                            out.append(ch)
-                        elif ch in " -_":
-                            out.append("-")
-                    base = "".join(out).strip("-") or "landlord"
-                    candidate = base
-                    i = 2
-                    while conn.execute(
-                        "SELECT 1 FROM landlord_profiles WHERE public_slug=?",
-                        (candidate,)
-                    ).fetchone():
-                        candidate = f"{base}-{i}"
-                        i += 1
-                    slug = candidate
-
-                conn.execute("""
-                    UPDATE landlord_profiles
-                       SET display_name=?,
-                           phone=?,
-                           website=?,
-                           bio=?,
-                           public_slug=COALESCE(?, public_slug)
-                     WHERE landlord_id=?
-                """, (display_name, phone, website, bio, slug, lid))
-                conn.commit()
+                # One transaction for ensure-row + slug pick + update
+                try:
+                    conn.execute("BEGIN")
+                    # Ensure profile row exists and read its slug in the same statement
+                    # (the no-op DO UPDATE makes RETURNING fire for existing rows too)
+                    prof = conn.execute("""
+                        INSERT INTO landlord_profiles(landlord_id) VALUES(?)
+                        ON CONFLICT(landlord_id) DO UPDATE SET landlord_id=excluded.landlord_id
+                        RETURNING public_slug
+                    """, (lid,)).fetchone()
+
+                    # Auto-generate slug if missing and we have a display name
+                    slug = prof[0] if prof else None
+                    if not slug and display_name:
+                        slug = unique_public_slug(conn, slugify(display_name))
+
+                    conn.execute("""
+                        UPDATE landlord_profiles
+                           SET display_name=?,
+                               phone=?,
+                               website=?,
+                               bio=?,
+                               public_slug=COALESCE(?, public_slug)
+                         WHERE landlord_id=?
+                    """, (display_name, phone, website, bio, slug, lid))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
                 flash("Profile updated.", "ok")
 
             elif action == "delete_landlord":
-                # Cascade delete: profile, then landlord
-                conn.execute("DELETE FROM landlord_profiles WHERE landlord_id=?", (lid,))
-                conn.execute("DELETE FROM landlords WHERE id=?", (lid,))
-                conn.commit()
+                # Cascade delete: profile, then landlord (one transaction)
+                try:
+                    conn.execute("BEGIN")
+                    conn.execute("DELETE FROM landlord_profiles WHERE landlord_id=?", (lid,))
+                    conn.execute("DELETE FROM landlords WHERE id=?", (lid,))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                invalidate_stats_cache()
                 flash("Landlord deleted.", "ok")
                 return redirect(url_for("admin.admin_landlords"))
 
-        # GET (or after POST updates)
-        landlord = conn.execute(
-            "SELECT * FROM landlords WHERE id=?", (lid,)
-        ).fetchone()
-        if not landlord:
+        # GET (or after POST updates): landlord + profile in one round-trip
+        row = conn.execute("""
+            SELECT l.id, l.email, l.created_at,
+                   p.landlord_id AS p_landlord_id,
+                   p.display_name, p.public_slug, p.phone, p.website, p.bio,
+                   COALESCE(p.is_verified, 0) AS is_verified
+              FROM landlords l
+         LEFT JOIN landlord_profiles p ON p.landlord_id = l.id
+             WHERE l.id=?
+        """, (lid,)).fetchone()
+        if not row:
             flash("Landlord not found.", "error")
             return redirect(url_for("admin.admin_landlords"))
 
-        profile = conn.execute(
-            "SELECT * FROM landlord_profiles WHERE landlord_id=?", (lid,)
-        ).fetchone()
-        houses = conn.execute(
-            "SELECT * FROM houses WHERE landlord_id=? ORDER BY created_at DESC",
-            (lid,)
-        ).fetchall()
+        landlord = {k: row[k] for k in ("id", "email", "created_at")}
+        profile = None
+        if row["p_landlord_id"] is not None:
+            profile = {k: row[k] for k in ("display_name", "public_slug", "phone",
+                                           "website", "bio", "is_verified")}
+
+        # Houses, keyset-paginated like the landlords list; served in index
+        # order by idx_houses_landlord_created (landlord_id, created_at, rowid).
+        before_ts = request.args.get("before_ts") or None
+        try:
+            before_id = int(request.args.get("before_id") or 0)
+        except Exception:
+            before_id = 0
+        if not before_id:
+            before_ts = None
+        houses = conn.execute("""
+            SELECT id, title, city, letting_type, bedrooms_total, created_at
+              FROM houses
+             WHERE landlord_id=?
+               AND (? IS NULL OR (created_at, id) < (?, ?))
+          ORDER BY created_at DESC, id DESC
+             LIMIT ?
+        """, (lid, before_ts, before_ts, before_id, _HOUSES_PER_PAGE + 1)).fetchall()
+
+        base_url = url_for("admin.admin_landlord_detail", lid=lid)
+        next_url = None
+        if len(houses) > _HOUSES_PER_PAGE:
+            houses = houses[:_HOUSES_PER_PAGE]
+            next_url = base_url + "?" + urlencode(
+                {"before_ts": houses[-1]["created_at"], "before_id": houses[-1]["id"]}
+            )
+        first_url = base_url if before_ts is not None else None
 
         return render_template(
             "admin_landlord_view.html",
-            landlord=landlord, profile=profile, houses=houses
+            landlord=landlord, profile=profile, houses=houses,
+            next_url=next_url, first_url=first_url,
         )
     finally:
         conn.close()
@@ -36,9 +36,21 @@ DEFAULTS = {
     "terms_md": "",
 }
 
+_UPSERT_SETTING_SQL = """
+    INSERT INTO site_settings(key, value) VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+     WHERE value IS NOT excluded.value
+"""
+
+# Only the keys this page manages are read (PK lookups, not a table scan)
+_ALL_KEYS = SETTING_KEYS + TEXT_KEYS
+_SELECT_SETTINGS_SQL = (
+    f"SELECT key, value FROM site_settings WHERE key IN ({','.join('?' * len(_ALL_KEYS))})"
+)
+
 def _get_settings(conn) -> dict[str, str]:
-    rows = conn.execute("SELECT key, value FROM site_settings").fetchall()
-    got = {r["key"]: r["value"] for r in rows}
+    rows = conn.execute(_SELECT_SETTINGS_SQL, _ALL_KEYS).fetchall()
+    got = {k: v for k, v in rows}
     # ensure defaults for missing keys (do not write yet)
     for k, v in DEFAULTS.items():
         got.setdefault(k, v)
@@ -53,23 +65,20 @@ def admin_settings():
     conn = get_db()
     try:
         if request.method == "POST":
-            # Save each checkbox as "1" or "0"
-            for k in SETTING_KEYS:
-                val = "1" if request.form.get(k) == "on" else "0"
-                conn.execute(
-                    "INSERT OR REPLACE INTO site_settings(key, value) VALUES (?, ?)",
-                    (k, val),
-                )
-
-            # Save text fields exactly as provided
-            for k in TEXT_KEYS:
-                val = request.form.get(k, "")
-                conn.execute(
-                    "INSERT OR REPLACE INTO site_settings(key, value) VALUES (?, ?)",
-                    (k, val),
-                )
+            # Checkboxes are saved as "1" or "0"; text fields exactly as provided
+            rows = [(k, "1" if request.form.get(k) == "on" else "0") for k in SETTING_KEYS]
+            rows += [(k, request.form.get(k, "")) for k in TEXT_KEYS]
 
-            conn.commit()
+            # UPSERT rather than INSERT OR REPLACE: no delete + reinsert, and
+            # rows whose value is unchanged are not written at all. One
+            # prepared statement bound per key, one commit for the lot.
+            try:
+                conn.execute("BEGIN")
+                conn.executemany(_UPSERT_SETTING_SQL, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
             flash("Site settings saved.", "ok")
             return redirect(url_for("admin.admin_settings"))
 
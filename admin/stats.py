@@ -1,70 +1,104 @@
 # admin/stats.py
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime, timedelta
-from flask import render_template
+from flask import render_template, jsonify
 from db import get_db
 from . import bp, require_admin
 
 
-def _count(conn, table: str) -> int:
-    try:
-        row = conn.execute(f"SELECT COUNT(*) AS c FROM {table}").fetchone()
-        return int(row["c"] if row else 0)
-    except Exception:
-        return 0
+# Column names per table, read once: the dashboard only checks created_at,
+# which is never dropped. Missing tables are not cached (they may appear).
+_COLS: dict[str, frozenset[str]] = {}
+
+# Table name is bound, so every table shares one cached prepared statement
+_TABLE_COLUMNS_SQL = "SELECT name FROM pragma_table_info(?)"
+
+
+def _columns(conn, table: str) -> frozenset[str]:
+    cols = _COLS.get(table)
+    if cols is None:
+        try:
+            cols = frozenset(r[0] for r in conn.execute(_TABLE_COLUMNS_SQL, (table,)).fetchall())
+        except Exception:
+            return frozenset()
+        if cols:
+            _COLS[table] = cols
+    return cols
+
+
+def _counts(conn, tables, cutoffs: dict[str, str]) -> dict[str, tuple[int, dict[str, int]]]:
+    """
+    Total rows plus rows created since each cutoff, for every table in one
+    statement (one row per table, glued with UNION ALL). Period counts are
+    range scans on idx_<table>_created_at rather than a pass over every row.
+    Missing tables count as 0; so do periods on tables without created_at.
+    If the combined statement fails, each table is counted on its own so one
+    broken table doesn't zero the rest.
+    """
+    keys = list(cutoffs)
+    out = {t: (0, {k: 0 for k in keys}) for t in tables}
+    parts = []
+    for t in tables:
+        cols = _columns(conn, t)
+        if not cols:
+            continue
+        if "created_at" in cols:
+            sums = ", ".join(f"(SELECT COUNT(*) FROM {t} WHERE created_at >= ?)" for _ in keys)
+            params = [cutoffs[k] for k in keys]
+        else:
+            sums = ", ".join("0" for _ in keys)
+            params = []
+        parts.append((f"SELECT '{t}', COUNT(*), {sums} FROM {t}", params))
+    if not parts:
+        return out
+
+    def _store(rows):
+        for row in rows:
+            out[row[0]] = (int(row[1] or 0), {k: int(v) for k, v in zip(keys, row[2:])})
 
-
-def _has_column(conn, table: str, col: str) -> bool:
     try:
-        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
-        return col in cols
+        _store(conn.execute(
+            " UNION ALL ".join(sql for sql, _ in parts),
+            [p for _, params in parts for p in params],
+        ).fetchall())
     except Exception:
-        return False
+        for sql, params in parts:
+            try:
+                _store(conn.execute(sql, params).fetchall())
+            except Exception:
+                pass
+    return out
 
 
-def _count_since(conn, table: str, cutoff_iso: str) -> int:
-    # Only count when a created_at column exists
-    if not _has_column(conn, table, "created_at"):
-        return 0
-    try:
-        row = conn.execute(
-            f"SELECT COUNT(*) AS c FROM {table} WHERE created_at >= ?",
-            (cutoff_iso,),
-        ).fetchone()
-        return int(row["c"] if row else 0)
-    except Exception:
-        return 0
+# Dashboard numbers are a summary, so up to _STATS_TTL seconds stale is fine;
+# refreshes within that window skip the DB entirely.
+_STATS_TTL = 30
+_STATS_CACHE = {"ts": 0.0, "val": None}
+_STATS_CACHE_LOCK = threading.Lock()
 
 
-# ---- Photos helpers: house_images + room_images ----
-def _count_photos(conn) -> int:
-    return _count(conn, "house_images") + _count(conn, "room_images")
+def invalidate_stats_cache() -> None:
+    """Force the next dashboard hit to recount (call after admin deletes)."""
+    with _STATS_CACHE_LOCK:
+        _STATS_CACHE["ts"] = 0.0
 
 
-def _count_photos_since(conn, cutoff_iso: str) -> int:
-    return (
-        _count_since(conn, "house_images", cutoff_iso)
-        + _count_since(conn, "room_images", cutoff_iso)
-    )
+def _cached_stats() -> tuple[dict, dict] | None:
+    """Return the cached (totals, deltas) if still fresh, else None."""
+    with _STATS_CACHE_LOCK:
+        if _STATS_CACHE["val"] is not None and time.monotonic() - _STATS_CACHE["ts"] < _STATS_TTL:
+            return _STATS_CACHE["val"]
+    return None
 
 
-@bp.get("/dashboard", endpoint="dashboard")
-def admin_dashboard():
-    """Read-only stats dashboard at /admin/dashboard."""
-    r = require_admin()
-    if r:
-        return r
-
-    conn = get_db()
-
-    # Totals
-    totals = {
-        "landlords": _count(conn, "landlords"),
-        "houses":    _count(conn, "houses"),
-        "rooms":     _count(conn, "rooms"),
-        "photos":    _count_photos(conn),
-    }
+def _gather_stats() -> tuple[dict, dict]:
+    """Return (totals, deltas) for the dashboard, from cache when fresh."""
+    cached = _cached_stats()
+    if cached is not None:
+        return cached
 
     # Period cutoffs
     now = datetime.utcnow()
@@ -76,18 +110,63 @@ def admin_dashboard():
     }
     cutoffs = {k: v.isoformat() for k, v in periods.items()}
 
-    # Deltas per period
-    deltas = {k: {} for k in periods.keys()}
-    for period_key, cutoff_iso in cutoffs.items():
-        deltas[period_key]["landlords"] = _count_since(conn, "landlords", cutoff_iso)
-        deltas[period_key]["houses"]    = _count_since(conn, "houses", cutoff_iso)
-        deltas[period_key]["rooms"]     = _count_since(conn, "rooms", cutoff_iso)
-        deltas[period_key]["photos"]    = _count_photos_since(conn, cutoff_iso)
+    conn = get_db()
+    try:
+        # Totals + deltas per period: one aggregate per table, one round-trip
+        totals = {}
+        deltas = {k: {} for k in periods.keys()}
+        tables = {
+            "landlords": ("landlords",),
+            "houses":    ("houses",),
+            "rooms":     ("rooms",),
+            "photos":    ("house_images", "room_images"),
+        }
+        counts = _counts(conn, [n for names in tables.values() for n in names], cutoffs)
+        for key, names in tables.items():
+            totals[key] = 0
+            for period_key in periods:
+                deltas[period_key][key] = 0
+            for name in names:
+                total, since = counts[name]
+                totals[key] += total
+                for period_key, n in since.items():
+                    deltas[period_key][key] += n
+    finally:
+        conn.close()
+
+    with _STATS_CACHE_LOCK:
+        _STATS_CACHE.update(ts=time.monotonic(), val=(totals, deltas))
+    return totals, deltas
 
-    conn.close()
+
+@bp.get("/dashboard", endpoint="dashboard")
+def admin_dashboard():
+    """
+    Read-only stats dashboard at /admin/dashboard.
+    Counts are inlined when cached; otherwise the page is sent without them
+    and fetches /admin/dashboard/stats.json after it has painted.
+    """
+    r = require_admin()
+    if r:
+        return r
+
+    totals, deltas = _cached_stats() or (None, None)
 
     return render_template(
         "admin_dashboard.html",
         totals=totals,
         deltas=deltas,
     )
+
+
+@bp.get("/dashboard/stats.json", endpoint="dashboard_stats")
+def admin_dashboard_stats():
+    """Dashboard counts as JSON (same TTL cache as the page)."""
+    r = require_admin()
+    if r:
+        return r
+
+    totals, deltas = _gather_stats()
+    resp = jsonify({"totals": totals, "deltas": deltas})
+    resp.headers["Cache-Control"] = f"private, max-age={_STATS_TTL}"
+    return resp
@@ -5,7 +5,7 @@ import datetime
 from flask import Flask
 
 from config import SECRET_KEY
-from db import ensure_db
+from db import ensure_db, get_db
 from public import public_bp                     # public blueprint (has /p/<id>)
 from auth import auth_bp
 from admin import bp as admin_bp                 # shared admin blueprint
@@ -27,11 +27,8 @@ def create_app() -> Flask:
     @app.context_processor
     def inject_globals():
         """Inject BUILD_VERSION, now(), and footer_metrics for the base template."""
-        import datetime as _dt
         footer_metrics = []
         try:
-            # Lazy import to avoid circulars at import time
-            from db import get_db
             conn = get_db()
 
             # Read feature flags (defaulting to '0' when missing)
@@ -86,7 +83,7 @@ def create_app() -> Flask:
 
         return {
             "BUILD_VERSION": build_version,
-            "now": _dt.datetime.utcnow,
+            "now": datetime.datetime.utcnow,
             "footer_metrics": footer_metrics,
         }
 
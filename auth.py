@@ -123,22 +123,22 @@ def signup():
                 flash("That email is already registered. Try logging in.", "error")
                 return render_template("signup.html", terms_html=terms_html)
 
-            # Create account
+            # Create account + minimal profile in one transaction
             ph = generate_password_hash(password)
-            conn.execute(
-                "INSERT INTO landlords(email, password_hash, created_at) VALUES (?,?,?)",
-                (email, ph, dt.utcnow().isoformat()),
-            )
-            conn.commit()
-
-            # Create minimal profile
-            row = conn.execute("SELECT id FROM landlords WHERE email=?", (email,)).fetchone()
-            lid = row["id"]
-            conn.execute(
-                "INSERT OR IGNORE INTO landlord_profiles(landlord_id, display_name, public_slug) VALUES (?,?,?)",
-                (lid, email.split('@')[0], None)
-            )
-            conn.commit()
+            try:
+                conn.execute("BEGIN")
+                lid = conn.execute(
+                    "INSERT INTO landlords(email, password_hash, created_at) VALUES (?,?,?)",
+                    (email, ph, dt.utcnow().isoformat()),
+                ).lastrowid
+                conn.execute(
+                    "INSERT OR IGNORE INTO landlord_profiles(landlord_id, display_name, public_slug) VALUES (?,?,?)",
+                    (lid, email.split('@')[0], None)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
             # Session
             session["landlord_id"] = lid
@@ -182,7 +182,7 @@ def login():
                     flash("Email and password are required.", "error")
                     return render_template("login.html")
 
-                row = conn.execute("SELECT * FROM landlords WHERE email=?", (email,)).fetchone()
+                row = conn.execute("SELECT id, password_hash FROM landlords WHERE email=?", (email,)).fetchone()
             finally:
                 conn.close()
 
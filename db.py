@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
 from datetime import datetime as dt
 from pathlib import Path
 
@@ -27,16 +28,80 @@ except Exception as e:
 # -----------------------------------------------------------------------------
 # Connection helper (durability + safety)
 # -----------------------------------------------------------------------------
+# journal_mode=WAL is stored in the DB file itself, so it only needs setting
+# once per process; the rest are per-connection and go in one executescript.
+# (busy_timeout is covered by connect(timeout=15).)
+# synchronous=NORMAL is crash-safe under WAL but a power loss can drop the last
+# few commits; set DB_SYNCHRONOUS=FULL where that matters more than write speed.
+_SYNC_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+DB_SYNCHRONOUS = os.environ.get("DB_SYNCHRONOUS", "NORMAL").strip().upper()
+if DB_SYNCHRONOUS not in _SYNC_MODES:
+    print(f"[db] Ignoring DB_SYNCHRONOUS={DB_SYNCHRONOUS!r}; using NORMAL")
+    DB_SYNCHRONOUS = "NORMAL"
+
+_WAL_READY = False
+_CONN_PRAGMAS = f"""
+    PRAGMA foreign_keys = ON;
+    PRAGMA synchronous = {DB_SYNCHRONOUS};
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -20000;    -- ~20 MB page cache
+"""
+
+# Per-thread pool of idle connections. Callers keep the usual
+# `conn = get_db() ... conn.close()` pattern: close() rolls back anything left
+# open and parks the connection for the next get_db() on the same thread, so
+# requests skip connect + PRAGMA setup. Nested get_db() calls still get their
+# own connection. The pool is dropped after a fork (never share across processes).
+_POOL_MAX_IDLE = 4
+_POOL = threading.local()
+
+def _idle_connections() -> list:
+    pid = os.getpid()
+    if getattr(_POOL, "pid", None) != pid:
+        _POOL.pid = pid
+        _POOL.idle = []
+    return _POOL.idle
+
+class _PooledConnection(sqlite3.Connection):
+    _idle = False
+
+    def close(self):
+        if self._idle:
+            return  # already parked (double close)
+        try:
+            if self.in_transaction:
+                self.rollback()
+            idle = _idle_connections()
+            if len(idle) < _POOL_MAX_IDLE:
+                self._idle = True
+                idle.append(self)
+                return
+        except Exception:
+            pass
+        super().close()
+
 def get_db():
-    conn = sqlite3.connect(DB_PATH, timeout=15, isolation_level=None)
+    global _WAL_READY
+    idle = _idle_connections()
+    while idle:
+        conn = idle.pop()
+        conn._idle = False
+        try:
+            conn.execute("SELECT 1")
+            return conn
+        except Exception:
+            pass  # closed or broken; fall through to a fresh one
+    # Pooled connections live across requests, so their prepared-statement LRU
+    # (keyed by SQL text) stays warm; 256 covers every distinct query in the app.
+    conn = sqlite3.connect(DB_PATH, timeout=15, isolation_level=None,
+                           factory=_PooledConnection, cached_statements=256)
     conn.row_factory = sqlite3.Row
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")
-        conn.execute("PRAGMA synchronous = FULL")
-        conn.execute("PRAGMA busy_timeout = 15000")
-        conn.execute("PRAGMA temp_store = MEMORY")
-        conn.execute("PRAGMA mmap_size = 268435456")
+        if not _WAL_READY:
+            conn.execute("PRAGMA journal_mode = WAL")
+            _WAL_READY = True
+        conn.executescript(_CONN_PRAGMAS)
     except Exception:
         pass
     return conn
@@ -53,8 +118,9 @@ def table_exists(conn: sqlite3.Connection, name: str) -> bool:
 
 def table_has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
     try:
-        cur = conn.execute(f"PRAGMA table_info({table})")
-        return any(r["name"] == column for r in cur.fetchall())
+        return conn.execute(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name=?", (table, column)
+        ).fetchone() is not None
     except Exception:
         return False
 
@@ -84,6 +150,59 @@ def _ensure_setting(conn: sqlite3.Connection, key: str, default_value: str) -> N
     except Exception as e:
         print(f"[MIGRATE] ensure setting {key}:", e)
 
+# -----------------------------------------------------------------------------
+# Admin landlord search index (FTS5, trigram tokenizer)
+# -----------------------------------------------------------------------------
+# One row per landlord (rowid = landlords.id) holding email + display_name,
+# kept in step by triggers. Trigram matching is substring matching, so it
+# answers the same "contains q" question as LIKE '%q%' without a full scan.
+# Needs SQLite 3.34+ built with FTS5; if either is missing the table is simply
+# absent and the admin search keeps using LIKE.
+_LANDLORD_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS landlords_fts_ai AFTER INSERT ON landlords BEGIN
+         INSERT INTO landlords_fts(rowid, email, display_name)
+         VALUES (new.id, new.email,
+                 COALESCE((SELECT display_name FROM landlord_profiles WHERE landlord_id = new.id), ''));
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS landlords_fts_au AFTER UPDATE OF email ON landlords BEGIN
+         UPDATE landlords_fts SET email = new.email WHERE rowid = new.id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS landlords_fts_ad AFTER DELETE ON landlords BEGIN
+         DELETE FROM landlords_fts WHERE rowid = old.id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS landlord_profiles_fts_ai AFTER INSERT ON landlord_profiles BEGIN
+         UPDATE landlords_fts SET display_name = COALESCE(new.display_name, '') WHERE rowid = new.landlord_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS landlord_profiles_fts_au AFTER UPDATE OF display_name ON landlord_profiles BEGIN
+         UPDATE landlords_fts SET display_name = COALESCE(new.display_name, '') WHERE rowid = new.landlord_id;
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS landlord_profiles_fts_ad AFTER DELETE ON landlord_profiles BEGIN
+         UPDATE landlords_fts SET display_name = '' WHERE rowid = old.landlord_id;
+       END""",
+)
+
+def _ensure_landlord_search_index(conn: sqlite3.Connection) -> None:
+    if table_exists(conn, "landlords_fts"):
+        return
+    try:
+        conn.execute("BEGIN")
+        conn.execute(
+            "CREATE VIRTUAL TABLE landlords_fts USING fts5(email, display_name, tokenize='trigram')"
+        )
+        conn.execute("""
+            INSERT INTO landlords_fts(rowid, email, display_name)
+            SELECT l.id, l.email, COALESCE(p.display_name, '')
+              FROM landlords l
+         LEFT JOIN landlord_profiles p ON p.landlord_id = l.id
+        """)
+        for stmt in _LANDLORD_FTS_TRIGGERS:
+            conn.execute(stmt)
+        conn.commit()
+        print("[db] Landlord search index built")
+    except Exception as e:
+        conn.rollback()
+        print("[MIGRATE] landlord search index unavailable:", e)
+
 # -----------------------------------------------------------------------------
 # Schema bootstrap + non-destructive migrations (never drop/delete)
 # -----------------------------------------------------------------------------
@@ -413,6 +532,15 @@ def ensure_db():
             conn.commit()
         except Exception as e:
             print("[MIGRATE] backfill filenames:", e)
+        # Indexes were only created with the table; make sure older DBs have them.
+        # idx_house_images_primary matches select_images' ORDER BY, so listing a
+        # house's photos is an index walk with no sort step.
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_house_images_house ON house_images(house_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_house_images_primary ON house_images(house_id, is_primary DESC, sort_order ASC, id ASC)")
+            conn.commit()
+        except Exception as e:
+            print("[MIGRATE] house_images indexes:", e)
 
     # -------------------------------------------------------------------------
     # NEW SUMMARY / CONTROL FIELDS (your request)
@@ -429,6 +557,26 @@ def ensure_db():
     # Landlord profiles: admin toggle for new signups
     _safe_add_column(conn, "landlord_profiles", "ADD COLUMN enable_new_landlord INTEGER NOT NULL DEFAULT 1")
 
+    # A landlord's houses, newest first (landlord dashboard + admin landlord view).
+    # landlord_profiles is keyed by landlord_id already (PRIMARY KEY).
+    try:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_houses_landlord_created ON houses(landlord_id, created_at)")
+        conn.commit()
+    except Exception as e:
+        print("[MIGRATE] houses landlord index:", e)
+
+    # Admin dashboard "new since" counts: each period is a
+    # COUNT(*) ... WHERE created_at >= ? subquery, which this index turns
+    # into a range scan instead of a pass over every full row.
+    for table in ("landlords", "houses", "rooms", "house_images", "room_images"):
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table}(created_at)")
+            conn.commit()
+        except Exception as e:
+            print(f"[MIGRATE] {table} created_at index:", e)
+
+    _ensure_landlord_search_index(conn)
+
     conn.close()
 
 # Run migrations at import
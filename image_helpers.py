@@ -1,15 +1,33 @@
 # image_helpers.py
 from __future__ import annotations
 
-import io, os, time, logging, math
+import io, os, time, logging, functools, secrets, tempfile
 from datetime import datetime as dt
+from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+import PIL
 from PIL import Image, ImageDraw, ImageOps, ImageFont
 
 # ------------ Logging ------------
 logger = logging.getLogger("student_palace.uploads")
 
+# Boot log so Render logs show which Pillow build is serving uploads.
+# Pillow-SIMD is a drop-in replacement (same API) and reports a ".postN" version.
+_PIL_IS_SIMD = ".post" in PIL.__version__
+print(f"[image_helpers] Pillow {PIL.__version__} (SIMD build: {'yes' if _PIL_IS_SIMD else 'no'})")
+
+# Optional libjpeg-turbo encoder (PyTurboJPEG). Needs the system libturbojpeg;
+# if it isn't installed we fall back to Pillow's own JPEG encoder.
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420, TJFLAG_PROGRESSIVE, TJFLAG_FASTDCT
+    _TJ = TurboJPEG()
+except Exception:
+    _TJ = None
+print(f"[image_helpers] JPEG encoder: {'turbojpeg' if _TJ is not None else 'pillow'}")
+
 # ------------ Config ------------
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 STATIC_ROOT = os.path.join(PROJECT_ROOT, "static")
@@ -19,15 +37,18 @@ MAX_FILES_PER_HOUSE = 5
 FILE_SIZE_LIMIT_BYTES = 5 * 1024 * 1024  # 5 MB
 ALLOWED_MIMES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 MAX_BOUND = 1600
+JPEG_QUALITY = 85
 WATERMARK_TEXT = os.environ.get("WATERMARK_TEXT", "Student Palace")
 
 # Target landscape aspect (W:H) for portrait images we letterbox
 _LB = os.environ.get("LANDSCAPE_ASPECT", "16:9")
 try:
     _num, _den = _LB.split(":")
-    LANDSCAPE_ASPECT = max(1.0, float(_num) / float(_den))
+    _ratio = max(Fraction(1), Fraction(_num.strip()) / Fraction(_den.strip())).limit_denominator(1000)
 except Exception:
-    LANDSCAPE_ASPECT = 16.0 / 9.0
+    _ratio = Fraction(16, 9)
+# Kept as an exact (num, den) pair so padding widths use integer maths
+LANDSCAPE_RATIO = (_ratio.numerator, _ratio.denominator)
 
 # Side panel colour = page light purple (#f9f7ff)
 LETTERBOX_COLOR = (249, 247, 255)
@@ -46,7 +67,6 @@ def file_abs_path(filename: str) -> str:
 # ------------ Image helpers ------------
 
 def _rand_token(n: int = 6) -> str:
-    import secrets
     return secrets.token_hex(max(3, n // 2))
 
 def read_limited(file_storage) -> Optional[bytes]:
@@ -54,75 +74,134 @@ def read_limited(file_storage) -> Optional[bytes]:
     file_storage.stream.seek(0)
     return data if data else None
 
-def open_image_safely(buf: bytes) -> Image.Image:
+def open_image_safely(buf: bytes, *, bound: int = MAX_BOUND) -> Image.Image:
     im = Image.open(io.BytesIO(buf))
+    # JPEG only (no-op for PNG/WEBP/GIF): ask libjpeg to decode at 1/2, 1/4 or 1/8
+    # scale in the DCT domain, never going below `bound` on the longest side.
+    # Phone photos (4000px+) then decode at a fraction of the cost and
+    # resize_longest only has a small refinement step left.
+    w, h = im.size
+    longest = max(w, h)
+    if longest >= 2 * bound:
+        im.draft(None, (-(-w * bound // longest), -(-h * bound // longest)))
     try:
         im = ImageOps.exif_transpose(im)
     except Exception:
         pass
-    if im.mode not in ("RGB", "L"):
-        im = im.convert("RGBA")
-        bg = Image.new("RGBA", im.size, (255, 255, 255, 255))
-        bg.alpha_composite(im)
-        im = bg.convert("RGB")
-    else:
+    if im.mode not in ("RGB", "L") and (im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info):
+        # Flatten onto white with a single masked paste (no RGBA canvas).
+        rgba = im if im.mode == "RGBA" else im.convert("RGBA")
+        bg = Image.new("RGB", im.size, (255, 255, 255))
+        bg.paste(rgba, mask=rgba)
+        im = bg
+    elif im.mode != "RGB":
         im = im.convert("RGB")
     return im
 
 def resize_longest(im: Image.Image, bound: int = MAX_BOUND) -> Image.Image:
+    """Downscale so the longest side is <= bound. Returns `im` itself when already small enough."""
     w, h = im.size
     longest = max(w, h)
     if longest <= bound:
-        return im.copy()
+        return im
     scale = bound / float(longest)
-    return im.resize((int(w * scale), int(h * scale)), Image.LANCZOS)
-
-def pad_portrait_to_landscape(im: Image.Image, *, aspect: float = LANDSCAPE_ASPECT,
+    size = (int(w * scale), int(h * scale))
+    if longest >= 2 * bound:
+        # Big downscale: cheap integer box reduction first (stays >= bound),
+        # then a bilinear pass for the small remainder. Visually the same as
+        # LANCZOS at JPEG q=85, for a fraction of the cost.
+        return im.reduce(longest // bound).resize(size, Image.BILINEAR)
+    return im.resize(size, Image.LANCZOS)
+
+def pad_portrait_to_landscape(im: Image.Image, *, ratio: Tuple[int,int] = LANDSCAPE_RATIO,
                               color: Tuple[int,int,int] = LETTERBOX_COLOR) -> Tuple[Image.Image, int]:
     """
     If portrait, pad left/right to reach target landscape aspect (no crop).
     Returns (canvas, content_left_offset) so we can anchor watermark to the photo area.
+    Images within 2% of the target width are left as they are.
     """
     w, h = im.size
     if h <= w:
         return im, 0  # already landscape/square; no letterbox
 
-    target_w = int(math.ceil(h * aspect))
-    if target_w <= w:
+    num, den = ratio
+    if h * num * 50 <= w * den * 51:  # h*aspect <= w*1.02
         return im, 0
+    target_w = (h * num + den - 1) // den  # ceil(h * num / den)
 
-    canvas = Image.new("RGB", (target_w, h), color)
+    # Only the side bars need the letterbox colour; the photo covers the middle.
+    canvas = Image.new("RGB", (target_w, h))
     x = (target_w - w) // 2
+    canvas.paste(color, (0, 0, x, h))
+    canvas.paste(color, (x + w, 0, target_w, h))
     canvas.paste(im, (x, 0))
     return canvas, x
 
-def _load_font_for_short_side(short_side: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+def _font_size_for_short_side(short_side: int) -> int:
     # Scale by the *shorter* side so text looks consistent across orientations.
-    font_size = max(14, short_side // 16)
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "DejaVuSans-Bold.ttf",
-        "DejaVuSans.ttf",
-    ]
-    for p in candidates:
+    return max(14, short_side // 16)
+
+_FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "DejaVuSans-Bold.ttf",
+    "DejaVuSans.ttf",
+]
+
+def _find_font_path() -> Optional[str]:
+    """First candidate FreeType can open (absolute or on its search path), else None."""
+    for p in _FONT_CANDIDATES:
+        try:
+            ImageFont.truetype(p, 14)
+            return p
+        except Exception:
+            pass
+    return None
+
+# Probed once at import; per-size fonts are then a single truetype() call.
+_FONT_PATH = _find_font_path()
+
+@functools.lru_cache(maxsize=32)
+def _load_font(font_size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    if _FONT_PATH:
         try:
-            return ImageFont.truetype(p, font_size)
+            return ImageFont.truetype(_FONT_PATH, font_size)
         except Exception:
             pass
     return ImageFont.load_default()
 
-def watermark(im: Image.Image, text: str, *, anchor_left: int = 0) -> Image.Image:
+@functools.lru_cache(maxsize=32)
+def _render_watermark_sprite(text: str, font_size: int) -> Image.Image:
+    """
+    Rasterize the soft shadow + white text once per (text, font size).
+    The sprite is only as big as the text, with the text origin at (0, 0),
+    so callers composite it at the watermark position. Treat as read-only.
     """
-    Place watermark top-left, offset to the *photo* area (so it never sits on the purple bars).
-    On landscape images (anchor_left == 0), nudge right by ~2 character widths.
+    font = _load_font(font_size)
+    _, _, right, bottom = font.getbbox(text)
+    size = (right + 1, bottom + 1)
+    # Lay the glyphs out once as a coverage mask, then stamp that mask twice
+    # (shadow offset by 1px, then text); same pixels as two draw.text calls.
+    glyphs = Image.new("L", size, 0)
+    ImageDraw.Draw(glyphs).text((0, 0), text, font=font, fill=255)
+    sprite = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    draw.bitmap((1, 1), glyphs, fill=(0, 0, 0, 120))
+    draw.bitmap((0, 0), glyphs, fill=(255, 255, 255, 185))
+    return sprite
+
+def watermark_in_place(im: Image.Image, text: str, *, anchor_left: int = 0) -> None:
     """
-    out = im.copy().convert("RGBA")
-    overlay = Image.new("RGBA", out.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    w, h = out.size
+    Draw the watermark directly onto an RGB image (mutates `im`).
+    Placed top-left, offset to the *photo* area (so it never sits on the purple bars);
+    on landscape images (anchor_left == 0) it is nudged right by ~2 character widths.
+    The sprite is pasted using its own alpha as the mask, so only the text box
+    is blended (src*a + dst*(1-a) in C) and nothing is converted or copied.
+    """
+    w, h = im.size
 
-    font = _load_font_for_short_side(min(w, h))
+    font_size = _font_size_for_short_side(min(w, h))
+    font = _load_font(font_size)
     pad = max(12, min(w, h) // 80)
 
     # >>> Only change: add ~2 character widths on landscape
@@ -135,28 +214,77 @@ def watermark(im: Image.Image, text: str, *, anchor_left: int = 0) -> Image.Imag
 
     y = pad
 
-    # soft shadow + white text
-    draw.text((x + 1, y + 1), text, font=font, fill=(0, 0, 0, 120))
-    draw.text((x, y), text, font=font, fill=(255, 255, 255, 185))
-
-    composed = Image.alpha_composite(out, overlay)
-    return composed.convert("RGB")
+    # soft shadow + white text (cached sprite); paste() clips to the canvas
+    if x >= w or y >= h:
+        return
+    sprite = _render_watermark_sprite(text, font_size)
+    im.paste(sprite, (x, y), sprite)
 
 def process_image(buf: bytes) -> Image.Image:
     """
     Pipeline: open -> resize (no crop) -> pad portrait to landscape (light purple) -> watermark (top-left of photo)
+    Every step after the resize works on the same buffer: the letterbox canvas is
+    the only other full-size allocation, and the watermark is drawn in place.
     """
     im = open_image_safely(buf)
     im = resize_longest(im, MAX_BOUND)
     im, left_pad = pad_portrait_to_landscape(im)
-    im = watermark(im, WATERMARK_TEXT, anchor_left=left_pad)
+    watermark_in_place(im, WATERMARK_TEXT, anchor_left=left_pad)
     return im
 
+def encode_jpeg(im: Image.Image) -> bytes:
+    """
+    Encode an RGB image as a progressive JPEG.
+    Uses libjpeg-turbo directly when available (its Huffman tables are already
+    tuned, so no separate optimize pass); otherwise Pillow's encoder.
+    """
+    if _TJ is not None:
+        return _TJ.encode(
+            np.asarray(im),
+            quality=JPEG_QUALITY,
+            pixel_format=TJPF_RGB,
+            jpeg_subsample=TJSAMP_420,
+            flags=TJFLAG_PROGRESSIVE | TJFLAG_FASTDCT,
+        )
+    out = io.BytesIO()
+    im.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 def save_jpeg(im: Image.Image, abs_path: str) -> Tuple[int, int, int]:
-    im.save(abs_path, format="JPEG", quality=85, optimize=True, progressive=True)
+    """
+    Write the JPEG atomically: encode, write to a temp file in the same folder,
+    fsync, rename over `abs_path`, then fsync the folder so the new name is
+    durable. A crash never leaves a half-written file under the final name.
+    """
+    data = encode_jpeg(im)
+    folder = os.path.dirname(abs_path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".jpg")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, abs_path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+        raise
+    _fsync_dir(folder)
     w, h = im.size
-    byt = os.path.getsize(abs_path)
-    return w, h, byt
+    return w, h, len(data)
 
 # ------------ DB schema guard ------------
 
@@ -166,9 +294,16 @@ REQUIRED_COLS = {
 }
 
 def get_cols(conn, table: str) -> List[str]:
-    return [r["name"] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+    return [r["name"] for r in conn.execute("SELECT name FROM pragma_table_info(?)", (table,)).fetchall()]
+
+# The schema doesn't change at runtime: once verified, skip the probe for the
+# rest of the process.
+_HOUSE_IMAGES_SCHEMA_OK = False
 
 def assert_house_images_schema(conn) -> None:
+    global _HOUSE_IMAGES_SCHEMA_OK
+    if _HOUSE_IMAGES_SCHEMA_OK:
+        return
     row = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='house_images'"
     ).fetchone()
@@ -178,40 +313,38 @@ def assert_house_images_schema(conn) -> None:
     missing = REQUIRED_COLS - cols
     if missing:
         raise RuntimeError(f"house_images schema missing columns: {sorted(missing)}")
+    _HOUSE_IMAGES_SCHEMA_OK = True
 
 # ------------ DB operations ------------
 
-def count_for_house(conn, hid: int) -> int:
-    return int(conn.execute(
-        "SELECT COUNT(*) AS c FROM house_images WHERE house_id=?", (hid,)
-    ).fetchone()["c"])
-
-def next_sort_order(conn, hid: int) -> int:
-    r = conn.execute(
-        "SELECT COALESCE(MAX(sort_order), 0) AS mx FROM house_images WHERE house_id=?",
-        (hid,)
-    ).fetchone()
-    return (int(r["mx"]) if r else 0) + 1
-
-def ensure_primary_flag(conn, hid: int) -> int:
-    r = conn.execute(
-        "SELECT COUNT(*) AS c FROM house_images WHERE house_id=? AND is_primary=1",
-        (hid,)
-    ).fetchone()
-    return 1 if (r and int(r["c"]) == 0) else 0
+def image_count_for_house(conn, hid: int, limit: int = MAX_FILES_PER_HOUSE) -> int:
+    """Number of photos for the house, capped at `limit`; stops reading at the limit-th row."""
+    return conn.execute(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM house_images WHERE house_id=? LIMIT ?)", (hid, limit)
+    ).fetchone()[0]
 
-def insert_image_row(conn, hid: int, fname: str, width: int, height: int, bytes_: int) -> None:
+def insert_image_row(conn, hid: int, fname: str, width: int, height: int, bytes_: int,
+                     *, created_at: Optional[str] = None) -> None:
+    """
+    Single statement: SQLite works out is_primary (first primary for the house)
+    and the next sort_order itself, instead of two extra round-trips.
+    """
     file_path = static_rel_path(fname)
-    values = (
-        hid, fname, fname, file_path, width, height, bytes_,
-        ensure_primary_flag(conn, hid), next_sort_order(conn, hid), dt.utcnow().isoformat()
-    )
     conn.execute("""
         INSERT INTO house_images(
           house_id, file_name, filename, file_path, width, height, bytes,
           is_primary, sort_order, created_at
-        ) VALUES (?,?,?,?,?,?,?,?,?,?)
-    """, values)
+        )
+        SELECT ?,?,?,?,?,?,?,
+               CASE WHEN EXISTS(
+                    SELECT 1 FROM house_images WHERE house_id=? AND is_primary=1
+               ) THEN 0 ELSE 1 END,
+               COALESCE((SELECT MAX(sort_order) FROM house_images WHERE house_id=?), 0) + 1,
+               ?
+    """, (
+        hid, fname, fname, file_path, width, height, bytes_,
+        hid, hid, created_at or dt.utcnow().isoformat()
+    ))
 
 def select_images(conn, hid: int) -> List[Dict]:
     rows = conn.execute("""
@@ -236,78 +369,151 @@ def select_images(conn, hid: int) -> List[Dict]:
     } for r in rows]
 
 def set_primary(conn, hid: int, img_id: int) -> None:
-    conn.execute("UPDATE house_images SET is_primary=0 WHERE house_id=?", (hid,))
-    conn.execute("UPDATE house_images SET is_primary=1 WHERE id=? AND house_id=?", (img_id, hid))
+    # Single statement, so readers never see the house with no primary photo
+    conn.execute(
+        "UPDATE house_images SET is_primary = CASE WHEN id=? THEN 1 ELSE 0 END WHERE house_id=?",
+        (img_id, hid),
+    )
 
 def delete_image(conn, hid: int, img_id: int) -> Optional[str]:
-    row = conn.execute("""
-        SELECT id, COALESCE(filename, file_name) AS filename
-          FROM house_images
-         WHERE id=? AND house_id=?""", (img_id, hid)).fetchone()
-    if not row:
+    rows = conn.execute("""
+        DELETE FROM house_images
+         WHERE id=? AND house_id=?
+        RETURNING COALESCE(filename, file_name) AS filename""", (img_id, hid)).fetchall()
+    return rows[0]["filename"] if rows else None
+
+# ------------ Parallel JPEG encode + write ------------
+
+# Encoding and writing the JPEG is the slowest step of an upload. libjpeg
+# releases the GIL while encoding, so a batch's files are written in parallel
+# on this pool; the request waits for them before inserting any rows.
+_ENCODE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="jpeg-encode")
+
+def _write_jpeg(im: Image.Image, abs_path: str, hid: int, fname: str) -> Optional[int]:
+    """
+    Runs on _ENCODE_POOL. Writes the JPEG and returns its byte size,
+    or None (with any partial file removed) if the write fails.
+    """
+    start = time.perf_counter()
+    try:
+        _, _, byt = save_jpeg(im, abs_path)
+    except Exception:
+        logger.exception(f"[UPLOAD] house={hid} saved={fname!r} failed=fs_write")
+        try:
+            os.remove(abs_path)
+        except Exception:
+            pass
         return None
-    fname = row["filename"]
-    conn.execute("DELETE FROM house_images WHERE id=? AND house_id=?", (img_id, hid))
-    return fname
+    elapsed = time.perf_counter() - start
+    logger.info(f"[UPLOAD] house={hid} saved={fname!r} size_bytes={byt} encode_elapsed={elapsed:.2f}s")
+    return byt
 
 # ------------ One-shot upload flow with timing logs ------------
 
-def accept_upload(conn, hid: int, file_storage, *, enforce_limit: bool = True) -> Tuple[bool, str]:
+def _prepare_upload(hid: int, file_storage) -> Tuple[Optional[Image.Image], str]:
     """
-    Returns (ok, message). Saves to disk + DB or reports a reason.
-    Emits timing logs to stdout (Render Logs) at INFO level.
+    The DB-free part of an upload: validate, read and process the image.
+    Returns (image, "") or (None, reason). Safe to run on a worker thread.
     """
-    start = time.perf_counter()
     original_name = getattr(file_storage, "filename", "") or "unnamed"
     mimetype = (getattr(file_storage, "mimetype", None) or "").lower()
 
-    if enforce_limit and count_for_house(conn, hid) >= MAX_FILES_PER_HOUSE:
-        logger.info(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} skipped=limit_reached")
-        return False, f"House already has {MAX_FILES_PER_HOUSE} photos."
-
+    # Cheap rejections first: none of these touch the file body.
     if mimetype not in ALLOWED_MIMES:
         logger.info(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} skipped=bad_mime")
-        return False, "Unsupported image type."
+        return None, "Unsupported image type."
+
+    declared = getattr(file_storage, "content_length", 0) or 0
+    if declared > FILE_SIZE_LIMIT_BYTES:
+        logger.info(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} skipped=too_large declared={declared}")
+        return None, "File is larger than 5 MB."
 
     data = read_limited(file_storage)
     if not data:
         logger.info(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} skipped=empty_read")
-        return False, "Could not read the file."
+        return None, "Could not read the file."
     if len(data) > FILE_SIZE_LIMIT_BYTES:
         logger.info(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} skipped=too_large size={len(data)}")
-        return False, "File is larger than 5 MB."
+        return None, "File is larger than 5 MB."
 
     try:
-        im = process_image(data)
+        return process_image(data), ""
     except Exception:
         logger.exception(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} failed=invalid_image")
-        return False, "File is not a valid image."
+        return None, "File is not a valid image."
 
-    ensure_upload_dir()
-    ts = dt.utcnow().strftime("%Y%m%d%H%M%S")
-    fname = f"house{hid}_{ts}_{_rand_token()}.jpg"
-    abs_path = file_abs_path(fname)
+def _new_upload_name(hid: int) -> Tuple[str, str]:
+    """Returns (file name, created_at) for a new upload."""
+    now = dt.utcnow()
+    return f"house{hid}_{now.strftime('%Y%m%d%H%M%S')}_{_rand_token()}.jpg", now.isoformat()
 
-    try:
-        w, h, byt = save_jpeg(im, abs_path)
-    except Exception:
-        logger.exception(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} failed=fs_write")
-        return False, "Server storage is not available."
+def accept_uploads_bulk(conn, hid: int, files) -> List[Tuple[bool, str]]:
+    """
+    Returns one (ok, message) per file, in input order. There is no
+    per-house limit check here; the caller trims the batch.
+    Decode/resize/watermark run in parallel threads, since Pillow releases
+    the GIL for that work, and the JPEG writes then run in parallel on
+    _ENCODE_POOL. Rows are inserted on `conn` in one transaction only once
+    their files are on disk, so every committed row points at a real file.
+    If the transaction fails, the files written for it are removed.
+    """
+    files = list(files)
+    if not files:
+        return []
+    start = time.perf_counter()
 
-    try:
-        assert_house_images_schema(conn)
-        insert_image_row(conn, hid, fname, w, h, byt)
-    except Exception as e:
+    workers = min(len(files), os.cpu_count() or 2)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload-prep") as pool:
+        prepared = list(pool.map(lambda f: _prepare_upload(hid, f), files))
+
+    results: List[Tuple[bool, str]] = [(False, reason) for _, reason in prepared]
+    if any(im is not None for im, _ in prepared):
         try:
-            os.remove(abs_path)
+            ensure_upload_dir()
         except Exception:
-            pass
-        logger.exception(f"[UPLOAD] house={hid} name={original_name!r} mime={mimetype} failed=db_insert")
-        return False, f"Couldn’t record image in DB: {e}"
+            logger.exception(f"[UPLOAD] house={hid} failed=mkdir")
+            return [(False, "Server storage is not available.") if im is not None else res
+                    for (im, _), res in zip(prepared, results)]
+
+    # Encode + write in parallel; wait for every file before touching the DB.
+    pending = []
+    for i, (im, _) in enumerate(prepared):
+        if im is None:
+            continue
+        fname, created_at = _new_upload_name(hid)
+        fut = _ENCODE_POOL.submit(_write_jpeg, im, file_abs_path(fname), hid, fname)
+        pending.append((i, im.size, fname, created_at, fut))
+
+    written = []
+    for i, (w, h), fname, created_at, fut in pending:
+        byt = fut.result()
+        if byt is None:
+            results[i] = (False, "Could not save the image.")
+        else:
+            written.append((i, w, h, fname, created_at, byt))
+
+    if written:
+        conn.execute("BEGIN")
+        try:
+            assert_house_images_schema(conn)
+            for _, w, h, fname, created_at, byt in written:
+                insert_image_row(conn, hid, fname, w, h, byt, created_at=created_at)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            logger.exception(f"[UPLOAD] house={hid} failed=db_insert")
+            for _, _, _, fname, _, _ in written:
+                try:
+                    os.remove(file_abs_path(fname))
+                except Exception:
+                    pass
+            raise
+        for i, *_ in written:
+            results[i] = (True, "Uploaded")
 
     elapsed = time.perf_counter() - start
     logger.info(
-        f"[UPLOAD] house={hid} name={original_name!r} saved={fname!r} mime={mimetype} "
-        f"size_bytes={byt} dims={w}x{h} elapsed={elapsed:.2f}s"
+        f"[UPLOAD] house={hid} bulk files={len(files)} saved={len(written)} "
+        f"workers={workers} elapsed={elapsed:.2f}s"
     )
-    return True, "Uploaded"
+    return results
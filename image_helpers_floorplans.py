@@ -1,7 +1,7 @@
 # image_helpers_floorplans.py
 from __future__ import annotations
 
-import os, io, uuid, datetime, logging
+import os, uuid, datetime, logging
 from typing import Tuple, Optional
 
 from PIL import Image
@@ -13,6 +13,7 @@ from image_helpers import (
     FILE_SIZE_LIMIT_BYTES,     # 5 MB
     ALLOWED_MIMES,             # {"image/jpeg","image/png","image/webp","image/gif"}
     process_image,             # open → EXIF fix → resize(1600) → portrait letterbox (light pink) → watermark (top-left; +2ch on landscape)
+    encode_jpeg,               # progressive JPEG bytes (libjpeg-turbo when available)
 )
 
 # === Config ===
@@ -42,9 +43,7 @@ def _process_plan_image(buf: bytes) -> Tuple[bytes, int, int]:
     watermark top-left (landscape is nudged ~2 chars to the right) → save optimized JPEG to bytes.
     """
     im: Image.Image = process_image(buf)  # returns PIL Image already watermarked
-    out = io.BytesIO()
-    im.save(out, format="JPEG", quality=85, optimize=True, progressive=True)
-    data = out.getvalue()
+    data = encode_jpeg(im)
     w, h = im.size
     return data, w, h
 
@@ -178,25 +177,28 @@ def accept_upload_plan(conn, house_id: int, werk_file, enforce_limit: bool = Tru
 
 # ---------- Primary & Delete ----------
 def set_primary_plan(conn, house_id: int, plan_id: int) -> None:
-    conn.execute("UPDATE house_floorplans SET is_primary=0 WHERE house_id=?", (house_id,))
-    conn.execute("UPDATE house_floorplans SET is_primary=1 WHERE id=? AND house_id=?", (plan_id, house_id,))
+    # Single statement, so readers never see the house with no primary plan
+    conn.execute(
+        "UPDATE house_floorplans SET is_primary = CASE WHEN id=? THEN 1 ELSE 0 END WHERE house_id=?",
+        (plan_id, house_id),
+    )
 
 def delete_plan(conn, house_id: int, plan_id: int) -> Optional[str]:
-    row = conn.execute("""
-        SELECT id, COALESCE(filename, file_name) AS filename
-          FROM house_floorplans
+    rows = conn.execute("""
+        DELETE FROM house_floorplans
          WHERE id=? AND house_id=?
-    """, (plan_id, house_id)).fetchone()
-    if not row:
+        RETURNING COALESCE(filename, file_name) AS filename
+    """, (plan_id, house_id)).fetchall()
+    if not rows:
         return None
-    fname = row["filename"]
-    conn.execute("DELETE FROM house_floorplans WHERE id=?", (plan_id,))
-    # re-pick a primary if needed
-    row2 = conn.execute("""
-        SELECT id FROM house_floorplans
-         WHERE house_id=?
-         ORDER BY is_primary DESC, sort_order ASC, id ASC
-    """, (house_id,)).fetchone()
-    if row2:
-        conn.execute("UPDATE house_floorplans SET is_primary=1 WHERE id=?", (row2["id"],))
+    fname = rows[0]["filename"]
+    # re-pick a primary if none is left (no write when one still is)
+    conn.execute("""
+        UPDATE house_floorplans SET is_primary=1
+         WHERE id = (SELECT id FROM house_floorplans
+                      WHERE house_id=?
+                      ORDER BY is_primary DESC, sort_order ASC, id ASC
+                      LIMIT 1)
+           AND is_primary=0
+    """, (house_id,))
     return fname
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from secrets import token_hex
 from datetime import datetime as dt
 from typing import Dict, List, Tuple, Optional
 
@@ -56,7 +57,7 @@ REQUIRED_COLS_ROOM = {
 }
 
 def _cols(conn, table: str) -> List[str]:
-    return [r["name"] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+    return [r["name"] for r in conn.execute("SELECT name FROM pragma_table_info(?)", (table,)).fetchall()]
 
 def assert_room_images_schema(conn) -> None:
     """
@@ -159,8 +160,11 @@ def select_images_room(conn, rid: int) -> List[Dict]:
     } for r in rows]
 
 def set_primary_room(conn, rid: int, img_id: int) -> None:
-    conn.execute("UPDATE room_images SET is_primary=0 WHERE room_id=?", (rid,))
-    conn.execute("UPDATE room_images SET is_primary=1 WHERE id=? AND room_id=?", (img_id, rid))
+    # Single statement, so readers never see the room with no primary photo
+    conn.execute(
+        "UPDATE room_images SET is_primary = CASE WHEN id=? THEN 1 ELSE 0 END WHERE room_id=?",
+        (img_id, rid),
+    )
 
 def delete_image_room(conn, rid: int, img_id: int) -> Optional[str]:
     """
@@ -168,33 +172,30 @@ def delete_image_room(conn, rid: int, img_id: int) -> Optional[str]:
     (by sort_order, then id) to be the new primary.
     Returns the filename so the caller can delete the file from disk, or None if not found.
     """
-    row = conn.execute("""
-        SELECT id,
-               COALESCE(filename, file_name) AS filename,
-               COALESCE(is_primary, 0)       AS is_primary
-          FROM room_images
+    rows = conn.execute("""
+        DELETE FROM room_images
          WHERE id=? AND room_id=?
-    """, (img_id, rid)).fetchone()
+        RETURNING COALESCE(filename, file_name) AS filename,
+                  COALESCE(is_primary, 0)       AS is_primary
+    """, (img_id, rid)).fetchall()
 
-    if not row:
+    if not rows:
         return None
 
+    row = rows[0]
     fname = row["filename"]
-    was_primary = int(row["is_primary"]) == 1
-
-    conn.execute("DELETE FROM room_images WHERE id=? AND room_id=?", (img_id, rid))
 
-    if was_primary:
-        next_row = conn.execute("""
-            SELECT id
-              FROM room_images
+    if int(row["is_primary"]) == 1:
+        # Promote the next image in the same statement that finds it
+        conn.execute("""
+            UPDATE room_images
+               SET is_primary = CASE WHEN id = (SELECT id FROM room_images
+                                                 WHERE room_id=?
+                                                 ORDER BY sort_order ASC, id ASC
+                                                 LIMIT 1)
+                                     THEN 1 ELSE 0 END
              WHERE room_id=?
-             ORDER BY sort_order ASC, id ASC
-             LIMIT 1
-        """, (rid,)).fetchone()
-        if next_row:
-            conn.execute("UPDATE room_images SET is_primary=0 WHERE room_id=?", (rid,))
-            conn.execute("UPDATE room_images SET is_primary=1 WHERE id=? AND room_id=?", (next_row["id"], rid))
+        """, (rid, rid))
 
     return fname
 
@@ -239,7 +240,6 @@ def accept_upload_room(conn, rid: int, file_storage, *, enforce_limit: bool = Tr
         return False, "Server storage is not available."
 
     ts = dt.utcnow().strftime("%Y%m%d%H%M%S")
-    from secrets import token_hex
     fname = f"room{rid}_{ts}_{token_hex(4)}.jpg"
     abs_path = file_abs_path_room(fname)
 
@@ -24,36 +24,34 @@ def landlord_accreditations():
 
     # Landlord profile (for the verified banner)
     profile = conn.execute(
-        "SELECT * FROM landlord_profiles WHERE landlord_id = ?",
+        "SELECT is_verified FROM landlord_profiles WHERE landlord_id = ?",
         (lid,),
     ).fetchone()
 
-    # List of active accreditations to choose from
+    # Active accreditations to choose from, each with this landlord's
+    # selection (if any) joined on: one query instead of two
     accreditations = conn.execute(
         """
         SELECT
-            id,
-            name,
-            help_text,
-            is_active,
-            sort_order,
-            1 AS has_notes
-        FROM accreditation_types
-        WHERE is_active = 1
-        ORDER BY sort_order ASC, name ASC
-        """
-    ).fetchall()
-
-    # Current selections for this landlord
-    rows = conn.execute(
-        """
-        SELECT accreditation_id, COALESCE(note,'') AS note
-        FROM landlord_accreditations
-        WHERE landlord_id = ?
+            a.id,
+            a.name,
+            a.help_text,
+            a.is_active,
+            a.sort_order,
+            1 AS has_notes,
+            la.landlord_id IS NOT NULL AS selected,
+            COALESCE(la.note,'') AS note
+        FROM accreditation_types a
+        LEFT JOIN landlord_accreditations la
+               ON la.accreditation_id = a.id AND la.landlord_id = ?
+        WHERE a.is_active = 1
+        ORDER BY a.sort_order ASC, a.name ASC
         """,
         (lid,),
     ).fetchall()
-    current = {row["accreditation_id"]: row["note"] for row in rows}
+
+    # Current selections for this landlord (among the schemes on the form)
+    current = {row["id"]: row["note"] for row in accreditations if row["selected"]}
 
     if request.method == "POST":
         # Which boxes were checked?
@@ -63,44 +61,44 @@ def landlord_accreditations():
             if request.form.get(key) in ("1", "on", "true"):
                 checked_ids.add(int(a["id"]))
 
-        # Upsert checked items (with note), delete unchecked
-        for a in accreditations:
-            aid = int(a["id"])
-            note_val = (request.form.get(f"note_{aid}") or "").strip()
-
-            if aid in checked_ids:
-                if aid in current:
-                    # Update existing
-                    conn.execute(
-                        """
-                        UPDATE landlord_accreditations
-                           SET note = ?
-                         WHERE landlord_id = ? AND accreditation_id = ?
-                        """,
-                        (note_val, lid, aid),
-                    )
-                else:
-                    # Insert new
-                    conn.execute(
-                        """
-                        INSERT INTO landlord_accreditations (landlord_id, accreditation_id, note)
-                        VALUES (?, ?, ?)
-                        """,
-                        (lid, aid, note_val),
-                    )
-            else:
-                # Remove if previously chosen
-                if aid in current:
-                    conn.execute(
-                        """
-                        DELETE FROM landlord_accreditations
-                         WHERE landlord_id = ? AND accreditation_id = ?
-                        """,
-                        (lid, aid),
-                    )
+        # Upsert checked items (with note), delete unchecked: one statement
+        # each, whatever the number of schemes, in one transaction
+        # (only active schemes are on the form, so only those are touched)
+        active_ids = [int(a["id"]) for a in accreditations]
+        upserts = [
+            (lid, aid, (request.form.get(f"note_{aid}") or "").strip())
+            for aid in active_ids if aid in checked_ids
+        ]
+        removed = [aid for aid in active_ids if aid in current and aid not in checked_ids]
 
-        conn.commit()
-        conn.close()
+        try:
+            conn.execute("BEGIN")
+            if upserts:
+                conn.executemany(
+                    """
+                    INSERT INTO landlord_accreditations (landlord_id, accreditation_id, note)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (landlord_id, accreditation_id)
+                    DO UPDATE SET note = excluded.note
+                     WHERE note IS NOT excluded.note
+                    """,
+                    upserts,
+                )
+            if removed:
+                conn.execute(
+                    f"""
+                    DELETE FROM landlord_accreditations
+                     WHERE landlord_id = ?
+                       AND accreditation_id IN ({",".join("?" * len(removed))})
+                    """,
+                    (lid, *removed),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
         flash("Accreditations updated.", "ok")
         return redirect(url_for("landlord.landlord_accreditations"))
 
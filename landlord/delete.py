@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 from flask import redirect, url_for, flash
 from db import get_db
+from utils import require_landlord, current_landlord_id, owned_house_or_none, remove_files_later
 from . import bp  # shared landlord blueprint
 
 # Resolve /static from project root (one level up from /landlord)
@@ -21,14 +22,6 @@ def _abs_static_path(rel_path: str) -> str:
     return abs_path
 
 
-def _unlink_quiet(path: str) -> None:
-    try:
-        if path and os.path.isfile(path):
-            os.remove(path)
-    except Exception:
-        pass  # never block delete on file errors
-
-
 # -----------------------------
 # Gather file paths helpers
 # -----------------------------
@@ -87,12 +80,23 @@ def _gather_room_file_paths(conn, room_id: int) -> list[str]:
 @bp.post("/landlord/houses/<int:house_id>/delete")
 def delete_house(house_id: int):
     """Delete a house and everything under it (rooms, photos, plans, docs) + files."""
+    r = require_landlord()
+    if r:
+        return r
+    lid = current_landlord_id()
     conn = get_db()
     try:
+        if not owned_house_or_none(conn, house_id, lid):
+            flash("House not found.", "error")
+            return redirect(url_for("landlord.landlord_houses"))
+
         # 1) Gather file paths BEFORE rows disappear
         file_paths = _gather_house_file_paths(conn, house_id)
 
-        # 2) Explicitly remove child rows (robust even if FKs are missing)
+        # 2) Explicitly remove child rows (robust even if FKs are missing),
+        #    all in one transaction with the house row: one commit, and
+        #    nothing is half-deleted if a statement fails.
+        conn.execute("BEGIN")
         conn.execute("""
             DELETE FROM room_images
              WHERE room_id IN (SELECT id FROM rooms WHERE house_id=?)
@@ -107,17 +111,19 @@ def delete_house(house_id: int):
         # 3) Finally delete the house row
         cur = conn.execute("DELETE FROM houses WHERE id=?", (house_id,))
         if cur.rowcount == 0:
+            conn.rollback()
             flash("House not found.", "error")
             return redirect(url_for("landlord.landlord_houses"))
 
         conn.commit()
 
         # 4) Best-effort file cleanup (after DB success)
-        for p in file_paths:
-            _unlink_quiet(p)
+        remove_files_later(file_paths)
 
         flash("House, rooms, photos, and documents deleted.", "success")
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         flash(f"Could not delete house: {e}", "error")
     finally:
         try:
@@ -131,13 +137,20 @@ def delete_house(house_id: int):
 @bp.post("/landlord/rooms/<int:room_id>/delete")
 def delete_room(room_id: int):
     """Delete a single room and its images (DB rows + files)."""
+    r = require_landlord()
+    if r:
+        return r
+    lid = current_landlord_id()
     conn = get_db()
     house_id = None
     try:
-        # Find the room for redirect destination
-        row = conn.execute(
-            "SELECT id, house_id FROM rooms WHERE id=?", (room_id,)
-        ).fetchone()
+        # Find the room (owned by this landlord) for redirect destination
+        row = conn.execute("""
+            SELECT r.id, r.house_id
+              FROM rooms r
+              JOIN houses h ON h.id = r.house_id
+             WHERE r.id=? AND h.landlord_id=?
+        """, (room_id, lid)).fetchone()
         if not row:
             flash("Room not found.", "error")
             return redirect(url_for("landlord.landlord_houses"))
@@ -145,16 +158,18 @@ def delete_room(room_id: int):
 
         # Gather files, then delete DB rows
         file_paths = _gather_room_file_paths(conn, room_id)
+        conn.execute("BEGIN")
         conn.execute("DELETE FROM room_images WHERE room_id=?", (room_id,))
         conn.execute("DELETE FROM rooms WHERE id=?", (room_id,))
         conn.commit()
 
         # Best-effort file cleanup
-        for p in file_paths:
-            _unlink_quiet(p)
+        remove_files_later(file_paths)
 
         flash("Room and its photos deleted.", "success")
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         flash(f"Could not delete room: {e}", "error")
     finally:
         try:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import time
+import secrets
 import logging
 from datetime import datetime as dt
 from typing import Optional
@@ -32,7 +33,6 @@ def _file_abs_path(filename: str) -> str:
     return os.path.join(EPC_DIR, filename)
 
 def _rand_token(n: int = 6) -> str:
-    import secrets
     return secrets.token_hex(max(3, n // 2))
 
 def _read_limited(file_storage) -> Optional[bytes]:
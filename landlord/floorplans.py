@@ -132,9 +132,7 @@ def house_floorplans(hid: int):
             flash(" ".join(parts), "ok")
         else:
             detail = " ".join(parts) if parts else "Upload failed."
-            flash(detail, "error")
-            for e in errors:
-                flash(e, "error")
+            flash(" ".join([detail, *errors]), "error")
 
         conn.close()
         return redirect(url_for("landlord.house_floorplans", hid=hid))
@@ -1,15 +1,15 @@
 # landlord/photos.py
 from __future__ import annotations
 
-import time, logging
+import os, time, logging
 from flask import render_template, request, redirect, url_for, flash
 from db import get_db
 from utils import current_landlord_id, require_landlord, owned_house_or_none
 from . import bp
 
 from image_helpers import (
-    accept_upload, select_images, set_primary, delete_image,
-    MAX_FILES_PER_HOUSE,
+    accept_uploads_bulk, select_images, set_primary, delete_image,
+    file_abs_path, image_count_for_house, MAX_FILES_PER_HOUSE,
     assert_house_images_schema,
 )
 
@@ -67,7 +67,7 @@ def house_photos(hid: int):
             )
 
         # Enforce house limit at the batch level
-        existing = len(select_images(conn, hid))
+        existing = image_count_for_house(conn, hid)
         remaining = max(0, MAX_FILES_PER_HOUSE - existing)
         if remaining <= 0:
             conn.close()
@@ -77,26 +77,22 @@ def house_photos(hid: int):
         # Only try up to remaining slots
         to_process = files[:remaining]
 
+        # images are processed in parallel, rows inserted in one transaction
+        try:
+            results = accept_uploads_bulk(conn, hid, to_process)  # batch limit enforced above
+        except Exception:
+            flash("Could not finalize the upload.", "error")
+            conn.close()
+            return redirect(url_for("landlord.house_photos", hid=hid))
+
         successes = 0
         errors = []
-        for f in to_process:
-            ok, msg = accept_upload(conn, hid, f, enforce_limit=False)  # batch limit enforced above
+        for f, (ok, msg) in zip(to_process, results):
             if ok:
                 successes += 1
             else:
                 errors.append(f"{getattr(f, 'filename', 'file')}: {msg}")
 
-        # commit/rollback once per batch
-        try:
-            if successes:
-                conn.commit()
-            else:
-                conn.rollback()
-        except Exception:
-            flash("Could not finalize the upload.", "error")
-            conn.close()
-            return redirect(url_for("landlord.house_photos", hid=hid))
-
         # Batch timing log
         elapsed = time.perf_counter() - batch_start
         logger.info(
@@ -119,9 +115,8 @@ def house_photos(hid: int):
         else:
             # No success at all: show details as error
             detail = " ".join(parts) if parts else "Upload failed."
-            flash(detail, "error")
-            for e in errors:
-                flash(e, "error")
+            # One flash for the summary and per-file reasons keeps the session cookie small
+            flash(" ".join([detail, *errors]), "error")
 
         conn.close()
         return redirect(url_for("landlord.house_photos", hid=hid))
@@ -188,8 +183,6 @@ def house_photos_delete(hid: int, img_id: int):
         conn.close()
 
         # after DB success, try to remove the file (best effort)
-        from image_helpers import file_abs_path
-        import os
         try:
             os.remove(file_abs_path(fname))
         except Exception:
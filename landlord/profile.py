@@ -1,7 +1,7 @@
 # profile.py
 from flask import render_template, request, redirect, url_for, flash
 from db import get_db
-from utils import current_landlord_id, require_landlord
+from utils import current_landlord_id, require_landlord, is_admin, slugify, unique_public_slug
 from . import bp
 import os
 from pathlib import Path
@@ -89,14 +89,11 @@ def landlord_profile():
         "SELECT * FROM landlord_profiles WHERE landlord_id=?", (lid,)
     ).fetchone()
     if not prof:
-        conn.execute(
-            "INSERT INTO landlord_profiles(landlord_id, display_name) VALUES (?,?)",
-            (lid, "")
-        )
-        conn.commit()
+        # RETURNING hands back the new row (with its column defaults) directly
         prof = conn.execute(
-            "SELECT * FROM landlord_profiles WHERE landlord_id=?", (lid,)
-        ).fetchone()
+            "INSERT INTO landlord_profiles(landlord_id, display_name) VALUES (?,?) RETURNING *",
+            (lid, "")
+        ).fetchall()[0]
 
     if request.method == "POST":
         action = request.form.get("action") or "save"
@@ -177,7 +174,6 @@ def landlord_profile():
 
         # --- Save text fields (default action) ---
         try:
-            from utils import slugify
             display_name = (request.form.get("display_name") or "").strip()
             phone = (request.form.get("phone") or "").strip()
             website = (request.form.get("website") or "").strip()
@@ -188,15 +184,7 @@ def landlord_profile():
 
             slug = prof["public_slug"]
             if not slug and display_name:
-                base = slugify(display_name)
-                candidate = base
-                i = 2
-                while conn.execute(
-                    "SELECT 1 FROM landlord_profiles WHERE public_slug=?", (candidate,)
-                ).fetchone():
-                    candidate = f"{base}-{i}"
-                    i += 1
-                slug = candidate
+                slug = unique_public_slug(conn, slugify(display_name))
 
             conn.execute("""
                 UPDATE landlord_profiles
@@ -308,6 +296,8 @@ def landlord_public_by_id(lid: int):
 # -----------------------
 @bp.route("/debug/profiles")
 def debug_profiles():
+    if not is_admin():
+        return redirect(url_for("admin.admin_login"))
     conn = get_db()
     rows = conn.execute(
         "SELECT landlord_id, display_name, logo_path, photo_path FROM landlord_profiles LIMIT 20"
@@ -318,6 +308,8 @@ def debug_profiles():
 
 @bp.route("/debug/fix-profile-paths")
 def debug_fix_profile_paths():
+    if not is_admin():
+        return redirect(url_for("admin.admin_login"))
     conn = get_db()
     # strip leading 'static/' if present
     conn.execute("""
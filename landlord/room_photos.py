@@ -1,7 +1,7 @@
 # landlord/room_photos.py
 from __future__ import annotations
 
-import time, logging
+import os, time, logging
 from flask import render_template, request, redirect, url_for, flash
 from db import get_db
 from utils import current_landlord_id, require_landlord, owned_house_or_none
@@ -9,7 +9,7 @@ from . import bp
 
 from image_helpers_rooms import (
     accept_upload_room, select_images_room, set_primary_room, delete_image_room,
-    MAX_FILES_PER_ROOM,
+    file_abs_path_room, MAX_FILES_PER_ROOM,
     assert_room_images_schema,
 )
 
@@ -118,9 +118,7 @@ def room_photos(hid: int, rid: int):
             flash(" ".join(parts), "ok")
         else:
             detail = " ".join(parts) if parts else "Upload failed."
-            flash(detail, "error")
-            for e in errors:
-                flash(e, "error")
+            flash(" ".join([detail, *errors]), "error")
 
         conn.close()
         return redirect(url_for("landlord.room_photos", hid=hid, rid=rid))
@@ -200,8 +198,6 @@ def room_photos_delete(hid: int, rid: int, img_id: int):
         conn.close()
 
         # cleanup disk
-        from image_helpers_rooms import file_abs_path_room
-        import os
         try:
             os.remove(file_abs_path_room(fname))
         except Exception:
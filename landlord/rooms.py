@@ -33,8 +33,6 @@ def _normalize_dates_for_is_let(vals: dict) -> None:
     - If let: let_until = next 30 June (if missing), available_from = let_until + 1 (if missing/<=).
     - If available: available_from = today (if missing), let_until = day before available_from.
     """
-    from datetime import datetime as dt, date, timedelta
-
     def _to_date(iso_str: str) -> date | None:
         try:
             return dt.strptime((iso_str or "").strip(), "%Y-%m-%d").date()
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from typing import List
 from db import get_db
 
@@ -12,8 +14,9 @@ from db import get_db
 def _table_has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
     """Return True if a table has the given column name."""
     try:
-        cur = conn.execute(f"PRAGMA table_info({table})")
-        return any(r["name"] == column for r in cur.fetchall())
+        return conn.execute(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name=?", (table, column)
+        ).fetchone() is not None
     except Exception:
         return False
 
@@ -70,6 +73,8 @@ def _ensure_admin_schema() -> None:
         # Add admin-managed columns on cities
         _safe_alter_add_column(conn, "cities", "postcode_prefixes TEXT NOT NULL DEFAULT ''")
         _safe_alter_add_column(conn, "cities", "sort_order INTEGER NOT NULL DEFAULT 0")
+        # Active-city lists are read in admin order (sort_order, name)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cities_sort ON cities(sort_order, name)")
 
         # Accreditations master table
         conn.execute("""
@@ -95,30 +100,33 @@ def _ensure_admin_schema() -> None:
         """)
         conn.commit()
 
-        # Defensive: backfill slug if any rows missing it (older DBs created without slug)
+        # Defensive: backfill slug if any rows missing it (older DBs created without slug).
+        # Only blank rows are fetched; free slugs are picked in Python against the
+        # set of taken ones and written back in one executemany + commit.
         try:
-            rows = conn.execute("SELECT id, name, slug FROM accreditation_types").fetchall()
-            for r in rows:
-                # Some SQLite adapters return tuples; but we expect Row. Be defensive:
-                rid = r["id"] if isinstance(r, sqlite3.Row) else r[0]
-                name = (r["name"] if isinstance(r, sqlite3.Row) else r[1]) or ""
-                slug = (r["slug"] if isinstance(r, sqlite3.Row) else r[2]) or ""
-
-                if not str(slug).strip():
-                    base = "".join(ch.lower() if str(ch).isalnum() else "-" for ch in name)
+            missing = conn.execute(
+                "SELECT id, name FROM accreditation_types WHERE TRIM(COALESCE(slug,''))='' ORDER BY id"
+            ).fetchall()
+            if missing:
+                taken = {slug for (slug,) in conn.execute(
+                    "SELECT slug FROM accreditation_types WHERE TRIM(COALESCE(slug,''))<>''"
+                )}
+                updates = []
+                for rid, name in missing:
+                    base = "".join(ch.lower() if str(ch).isalnum() else "-" for ch in (name or ""))
                     base = "-".join([p for p in base.split("-") if p])
                     if not base:
                         base = f"acc-{rid}"
                     candidate = base
                     i = 2
-                    while conn.execute(
-                        "SELECT 1 FROM accreditation_types WHERE slug=? AND id<>?",
-                        (candidate, rid)
-                    ).fetchone():
+                    while candidate in taken:
                         candidate = f"{base}-{i}"
                         i += 1
-                    conn.execute("UPDATE accreditation_types SET slug=? WHERE id=?", (candidate, rid))
-            conn.commit()
+                    taken.add(candidate)
+                    updates.append((candidate, rid))
+                conn.execute("BEGIN")
+                conn.executemany("UPDATE accreditation_types SET slug=? WHERE id=?", updates)
+                conn.commit()
         except Exception as e:
             print("[models] Accreditation slug backfill skipped:", e)
 
@@ -139,6 +147,63 @@ _ensure_admin_schema()
 # ------------------------------------------------------------
 # Public helpers (used by views/templates)
 # ------------------------------------------------------------
+# Active cities change only through /admin/cities, so the public and landlord
+# pages read them from a short-lived in-process cache. Admin writes call
+# invalidate_city_cache(); other worker processes catch up within the TTL.
+_CITY_CACHE_TTL = 30.0
+_CITY_CACHE = {
+    "ts": 0.0, "gen": 0, "by_admin": [], "by_name": [],
+    "names": frozenset(), "names_by_admin": (), "names_by_name": (),
+}
+_CITY_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_city_cache() -> None:
+    """Drop the cached active-city list (call after any write to `cities`)."""
+    with _CITY_CACHE_LOCK:
+        _CITY_CACHE["ts"] = 0.0
+        _CITY_CACHE["gen"] += 1
+
+
+def _active_cities_cached() -> dict:
+    """Return the city cache, refreshing it from the DB when expired. Raises on DB error."""
+    if time.monotonic() - _CITY_CACHE["ts"] < _CITY_CACHE_TTL:
+        return _CITY_CACHE
+    with _CITY_CACHE_LOCK:
+        if time.monotonic() - _CITY_CACHE["ts"] < _CITY_CACHE_TTL:
+            return _CITY_CACHE
+        gen = _CITY_CACHE["gen"]
+    conn = get_db()
+    try:
+        # Full rows: callers and templates may read optional columns
+        # (sort_order, postcode_prefixes, ...) that only some DBs have.
+        by_name = conn.execute(
+            "SELECT * FROM cities WHERE is_active=1 ORDER BY name ASC"
+        ).fetchall()
+        by_admin = by_name
+        if _table_has_column(conn, "cities", "sort_order"):
+            by_admin = conn.execute(
+                "SELECT * FROM cities WHERE is_active=1 ORDER BY sort_order ASC, name ASC"
+            ).fetchall()
+    finally:
+        conn.close()
+    # Name lists are built once per refresh, not per call
+    names_by_name = tuple(r["name"] for r in by_name)
+    names_by_admin = tuple(r["name"] for r in by_admin)
+    with _CITY_CACHE_LOCK:
+        # An admin write during the refresh bumps gen; keep the data but let
+        # the next call fetch again rather than trusting it for a full TTL.
+        _CITY_CACHE.update(
+            by_name=by_name,
+            by_admin=by_admin,
+            names=frozenset(names_by_name),
+            names_by_name=names_by_name,
+            names_by_admin=names_by_admin,
+            ts=time.monotonic() if _CITY_CACHE["gen"] == gen else 0.0,
+        )
+    return _CITY_CACHE
+
+
 def get_active_cities_safe(order_by_admin: bool = True):
     """
     Returns a list of active city rows (sqlite3.Row).
@@ -146,49 +211,29 @@ def get_active_cities_safe(order_by_admin: bool = True):
     Otherwise, order by name.
     On any DB error, returns [] (safe for templates).
     """
-    conn = None
     try:
-        conn = get_db()
-        order_clause = "ORDER BY name ASC"
-        if order_by_admin and _table_has_column(conn, "cities", "sort_order"):
-            order_clause = "ORDER BY sort_order ASC, name ASC"
-        rows = conn.execute(
-            f"SELECT * FROM cities WHERE is_active=1 {order_clause}"
-        ).fetchall()
-        return rows
+        cache = _active_cities_cached()
+        return list(cache["by_admin"] if order_by_admin else cache["by_name"])
     except Exception as e:
         print("[WARN] get_active_cities_safe:", e)
         return []
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
 def get_active_city_names(order_by_admin: bool = True) -> List[str]:
     """Convenience helper: returns just the active city names."""
-    return [r["name"] for r in get_active_cities_safe(order_by_admin=order_by_admin)]
+    try:
+        cache = _active_cities_cached()
+        return list(cache["names_by_admin"] if order_by_admin else cache["names_by_name"])
+    except Exception as e:
+        print("[WARN] get_active_city_names:", e)
+        return []
 
 
 def validate_city_active(city: str) -> bool:
     """True if the given city exists and is marked active."""
     if not city:
         return False
-    conn = None
     try:
-        conn = get_db()
-        row = conn.execute(
-            "SELECT 1 FROM cities WHERE name=? AND is_active=1",
-            (city,)
-        ).fetchone()
-        return bool(row)
+        return city in _active_cities_cached()["names"]
     except Exception:
         return False
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
@@ -1,7 +1,7 @@
 # public.py
 from __future__ import annotations
 
-from flask import Blueprint, render_template, request, abort
+from flask import Blueprint, render_template, request, abort, url_for
 from datetime import datetime as dt, date
 
 # Helpers
@@ -242,35 +242,33 @@ def property_public(house_id: int):
     except Exception:
         rooms = []
 
-    # Features (feature1..feature5)
-    def _haskey(row, key: str) -> bool:
-        try:
-            return key in row.keys()
-        except Exception:
-            return False
+    # Column sets built once (Row.keys() makes a new list on every call)
+    house_cols = frozenset(house.keys())
+    ll_cols = frozenset(ll.keys()) if ll else frozenset()
 
+    # Features (feature1..feature5)
     features = []
     for i in range(1, 6):
         k = f"feature{i}"
-        if _haskey(house, k) and house[k]:
+        if k in house_cols and house[k]:
             txt = str(house[k]).strip()
             if txt:
                 features.append(txt[:40])
 
     # House-level availability (optional columns)
     availability = {
-        "currently_let": int(house["is_let"]) if _haskey(house, "is_let") and house["is_let"] is not None else 0,
-        "available_from": house["available_from"] if _haskey(house, "available_from") else None,
-        "let_until": house["let_until"] if _haskey(house, "let_until") else None,
+        "currently_let": int(house["is_let"]) if "is_let" in house_cols and house["is_let"] is not None else 0,
+        "available_from": house["available_from"] if "available_from" in house_cols else None,
+        "let_until": house["let_until"] if "let_until" in house_cols else None,
     }
 
     conn.close()
 
     landlord = {
-        "display_name": (ll["display_name"] if ll and "display_name" in ll.keys() else ""),
-        "public_slug": (ll["public_slug"] if ll and "public_slug" in ll.keys() else ""),
-        "is_verified": int(ll["is_verified"]) if (ll and "is_verified" in ll.keys()) else 0,
-        "email": (ll["email"] if ll and "email" in ll.keys() else ""),
+        "display_name": (ll["display_name"] if "display_name" in ll_cols else ""),
+        "public_slug": (ll["public_slug"] if "public_slug" in ll_cols else ""),
+        "is_verified": int(ll["is_verified"]) if "is_verified" in ll_cols else 0,
+        "email": (ll["email"] if "email" in ll_cols else ""),
     }
 
     return render_template(
@@ -336,7 +334,6 @@ def properties():
     conn.close()
 
     # Build result dicts the template expects
-    from flask import url_for
     def make_cover_url(path):
         if not path:
             return None
@@ -1,5 +1,7 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from flask import session, redirect, url_for, flash, request
-from db import get_db
+from models import get_active_city_names, validate_city_active  # noqa: F401 (re-exported)
 
 def is_admin():
     return bool(session.get("is_admin"))
@@ -24,22 +26,45 @@ def slugify(name: str) -> str:
     slug = "".join(out).strip("-")
     return slug or "landlord"
 
+def unique_public_slug(conn, base: str) -> str:
+    """
+    `base` if no landlord profile uses it yet, else `base-N` with N one past the
+    highest numeric suffix in use. One query however many collisions there are.
+    Only all-digit tails count as suffixes (so `base-2024-lets` is ignored).
+    """
+    row = conn.execute("""
+        SELECT MAX(public_slug = ?) AS base_taken,
+               MAX(CASE WHEN SUBSTR(public_slug, LENGTH(?) + 2) NOT GLOB '*[^0-9]*'
+                        THEN CAST(SUBSTR(public_slug, LENGTH(?) + 2) AS INTEGER) END) AS max_suffix
+          FROM landlord_profiles
+         WHERE public_slug = ? OR public_slug LIKE ? || '-%'
+    """, (base, base, base, base, base)).fetchone()
+    if not row or not row[0]:
+        return base
+    return f"{base}-{max(row[1] or 0, 1) + 1}"
+
+# Deleting upload files after a DB delete is best effort, so it runs on a
+# single background worker instead of holding up the redirect. The worker
+# thread is joined at interpreter exit, so queued removals still finish.
+_FILE_CLEANUP = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-cleanup")
+
+def _unlink_quiet_all(paths) -> None:
+    for path in paths:
+        try:
+            if path and os.path.isfile(path):
+                os.remove(path)
+        except Exception:
+            pass  # never fail on file errors
+
+def remove_files_later(paths) -> None:
+    """Queue absolute file paths for best-effort removal off the request thread."""
+    paths = list(paths)
+    if paths:
+        _FILE_CLEANUP.submit(_unlink_quiet_all, paths)
+
 def get_active_cities_safe():
-    try:
-        conn = get_db()
-        rows = conn.execute("SELECT name FROM cities WHERE is_active=1 ORDER BY name ASC").fetchall()
-        conn.close()
-        return [r["name"] for r in rows]
-    except Exception:
-        return []
-
-def validate_city_active(city):
-    if not city:
-        return False
-    conn = get_db()
-    row = conn.execute("SELECT 1 FROM cities WHERE name=? AND is_active=1", (city,)).fetchone()
-    conn.close()
-    return bool(row)
+    # Active city names, ordered by name (served from the models.py TTL cache)
+    return get_active_city_names(order_by_admin=False)
 
 def clean_bool(field_name):
     return 1 if (request.form.get(field_name) == "on") else 0
@@ -12,13 +12,24 @@ DOUBLE_SIZES = {"Small double", "Double", "King"}
 # schema helpers (add-only)
 # -------------------------------
 def _table_info(conn: Connection, table: str) -> list[dict]:
-    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    # Convert to dicts keyed by name for convenience
-    return [dict(zip([c[0] for c in rows.description] if hasattr(rows, "description") else
-                     ["cid", "name", "type", "notnull", "dflt_value", "pk"], r)) for r in rows]
+    # pragma_table_info(?) binds the table name, so one prepared statement
+    # serves every table; rows converted to dicts keyed by name for convenience
+    cur = conn.execute("SELECT * FROM pragma_table_info(?)", (table,))
+    names = [c[0] for c in cur.description]
+    return [dict(zip(names, r)) for r in cur.fetchall()]
+
+# Column names per table. Columns are only ever added (never dropped) at
+# runtime, so this is filled on first use and refreshed after our own ALTERs;
+# recompute_house_summaries() then runs no PRAGMAs in the steady state.
+_COLS: dict[str, frozenset[str]] = {}
 
 def _has_column(conn: Connection, table: str, col: str) -> bool:
-    return any(row["name"] == col for row in _table_info(conn, table))
+    cols = _COLS.get(table)
+    if cols is None:
+        cols = frozenset(row["name"] for row in _table_info(conn, table))
+        if cols:  # don't cache a table that doesn't exist yet
+            _COLS[table] = cols
+    return col in cols
 
 def _safe_add_column(conn: Connection, table: str, ddl: str) -> None:
     """
@@ -31,6 +42,7 @@ def _safe_add_column(conn: Connection, table: str, ddl: str) -> None:
     except Exception:
         # If it already exists or ALTER fails for a benign reason, ignore.
         conn.rollback()
+    _COLS.pop(table, None)
 
 def ensure_house_rollup_columns(conn: Connection) -> None:
     """
@@ -82,13 +94,8 @@ def _iter_rooms_for_house(conn: Connection, house_id: int) -> Iterable[dict]:
     ).fetchall()
 
 
-def recompute_house_summaries(conn: Connection, house_id: int) -> Dict[str, Any]:
-    """
-    Recalculate and persist **totals** and **available-only** rollups for a house.
-    Returns the dict of values written.
-    """
-    ensure_house_rollup_columns(conn)
-
+def _house_summary_values(conn: Connection, house_id: int) -> Dict[str, Any]:
+    """Work out the **totals** and **available-only** rollups for a house (no writes)."""
     rows = list(_iter_rooms_for_house(conn, house_id))
 
     # Totals
@@ -143,38 +150,6 @@ def recompute_house_summaries(conn: Connection, house_id: int) -> Dict[str, Any]
 
     available_rooms_prices = json.dumps(available_prices_list, separators=(",", ":"))
 
-    # Persist to houses
-    conn.execute(
-        """
-        UPDATE houses SET
-            ensuites_total = ?,
-            available_rooms_total = ?,
-            available_rooms_prices = ?,
-            double_beds_total = ?,
-            suitable_for_couples_total = ?,
-            suitable_for_disabled_total = ?,
-            ensuites_available = ?,
-            double_beds_available = ?,
-            couples_ok_available = ?,
-            disabled_ok_available = ?
-        WHERE id = ?
-        """,
-        (
-            ensuites_total,
-            available_rooms_total,
-            available_rooms_prices,
-            double_beds_total,
-            suitable_for_couples_total,
-            suitable_for_disabled_total,
-            ensuites_available,
-            double_beds_available,
-            couples_ok_available,
-            disabled_ok_available,
-            house_id,
-        ),
-    )
-    conn.commit()
-
     return {
         "ensuites_total": ensuites_total,
         "available_rooms_total": available_rooms_total,
@@ -189,12 +164,51 @@ def recompute_house_summaries(conn: Connection, house_id: int) -> Dict[str, Any]
     }
 
 
+_UPDATE_ROLLUPS_SQL = """
+    UPDATE houses SET
+        ensuites_total = :ensuites_total,
+        available_rooms_total = :available_rooms_total,
+        available_rooms_prices = :available_rooms_prices,
+        double_beds_total = :double_beds_total,
+        suitable_for_couples_total = :suitable_for_couples_total,
+        suitable_for_disabled_total = :suitable_for_disabled_total,
+        ensuites_available = :ensuites_available,
+        double_beds_available = :double_beds_available,
+        couples_ok_available = :couples_ok_available,
+        disabled_ok_available = :disabled_ok_available
+    WHERE id = :house_id
+"""
+
+
+def recompute_house_summaries(conn: Connection, house_id: int) -> Dict[str, Any]:
+    """
+    Recalculate and persist **totals** and **available-only** rollups for a house.
+    Returns the dict of values written.
+    """
+    ensure_house_rollup_columns(conn)
+
+    values = _house_summary_values(conn, house_id)
+
+    # Persist to houses
+    conn.execute(_UPDATE_ROLLUPS_SQL, {**values, "house_id": house_id})
+    conn.commit()
+
+    return values
+
+
 def recompute_all_houses(conn: Connection) -> int:
     """
     Recalculate rollups for every house. Returns the number of houses processed.
     """
     ensure_house_rollup_columns(conn)
     house_ids = [row[0] for row in conn.execute("SELECT id FROM houses").fetchall()]
-    for hid in house_ids:
-        recompute_house_summaries(conn, hid)
+    params = [{**_house_summary_values(conn, hid), "house_id": hid} for hid in house_ids]
+    # One prepared UPDATE bound per house, one commit for the whole run
+    try:
+        conn.execute("BEGIN")
+        conn.executemany(_UPDATE_ROLLUPS_SQL, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     return len(house_ids)